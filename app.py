@@ -6,15 +6,33 @@ Optimized for Streamlit Cloud Deployment
 
 import streamlit as st
 import numpy as np
+import inspect
 import matplotlib.pyplot as plt
-from scipy import signal
-from scipy.fft import fft, fftfreq
-import librosa
-import soundfile as sf
-import io
+import logging
+import sqlite3
 import time
 from matplotlib.patches import Rectangle, FancyBboxPatch
 
+from dsp import (
+    STRING_FREQUENCIES, TUNINGS, TUNE_TOLERANCE, DETECTORS, DEFAULT_DETECTOR, DECIMATE_RATE,
+    HUM_HARMONICS, HUM_BANDWIDTH, VOCODER_FRAME_SECONDS,
+    FILTER_BANK, SpectrumAnalysis, decimation_factor, get_tuning_status, calculate_cents,
+    identify_string,
+    audio_fingerprint, waveform_envelope, HumCanceller,
+    hum_notch_response, estimate_phase_vocoder
+)
+from audio_io import MAX_DURATION, upload_fingerprint
+from polyphonic import STRUM_MIN_CONFIDENCE, analyze_strum
+from tracking import track_pitch, with_target, voiced_frames, sustained_pitch
+from live import StreamingTuner, MicrophoneSource, FileSource
+from profiling import ANALYSIS_STAGES, PERF_LOGGER, StageTimer
+from figure_cache import FIGURE_CACHE
+from disk_cache import DiskCache, cached_load_audio, cached_magnitude_spectrum, cached_process_audio
+from charts import (
+    waveform_chart, spectrum_chart, response_chart, pitch_track_chart,
+    strobe_phase_chart, tuning_meter_chart, stage_chart
+)
+
 # ==================== PAGE CONFIGURATION ====================
 st.set_page_config(
     page_title="🎸 Guitar Tuner Pro",
@@ -23,6 +41,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Stage timings are logged as one JSON line per analysis
+logging.basicConfig(format='%(asctime)s %(name)s %(message)s')
+PERF_LOGGER.setLevel(logging.INFO)
+
 # ==================== CUSTOM CSS ====================
 st.markdown("""
 <style>
@@ -170,6 +192,11 @@ st.markdown("""
         background: linear-gradient(135deg, #a1c4fd 0%, #c2e9fb 100%);
         border-color: #4facfe;
     }
+    
+    @keyframes strobeSpin {
+        from { transform: rotate(0deg); }
+        to { transform: rotate(360deg); }
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -186,17 +213,30 @@ if 'current_filename' not in st.session_state:
     st.session_state.current_filename = None
 if 'processing_complete' not in st.session_state:
     st.session_state.processing_complete = False
+if 'audio_hash' not in st.session_state:
+    st.session_state.audio_hash = None
+if 'filtered_hash' not in st.session_state:
+    st.session_state.filtered_hash = None
+if 'filtered_rate' not in st.session_state:
+    st.session_state.filtered_rate = None
+if 'filtered_source' not in st.session_state:
+    st.session_state.filtered_source = None
+if 'strum_readings' not in st.session_state:
+    st.session_state.strum_readings = None
+if 'decode_ms' not in st.session_state:
+    st.session_state.decode_ms = None
+if 'perf_timer' not in st.session_state:
+    st.session_state.perf_timer = None
+if 'perf_logged' not in st.session_state:
+    st.session_state.perf_logged = True
+if 'upload_hash' not in st.session_state:
+    st.session_state.upload_hash = None
+if 'failed_upload_hash' not in st.session_state:
+    st.session_state.failed_upload_hash = None
+if 'upload_error' not in st.session_state:
+    st.session_state.upload_error = None
 
 # ==================== DATA ====================
-STRING_FREQUENCIES = {
-    'E2 (6th - Low E)': 82.41,
-    'A2 (5th)': 110.00,
-    'D3 (4th)': 146.83,
-    'G3 (3rd)': 196.00,
-    'B3 (2nd)': 246.94,
-    'E4 (1st - High E)': 329.63
-}
-
 STRING_COLORS = {
     'E2 (6th - Low E)': '#ff6b6b',
     'A2 (5th)': '#ffd93d',
@@ -206,7 +246,13 @@ STRING_COLORS = {
     'E4 (1st - High E)': '#f472b6'
 }
 
-TUNE_TOLERANCE = 2.0
+STROBE_RINGS = (1, 2, 4)        # partial each ring follows: ring k drifts k times faster
+STROBE_STRIPES = 24
+
+# st.image took use_column_width before Streamlit 1.40; requirements.txt still allows 1.28
+IMAGE_STRETCH = {'use_container_width': True}
+if 'use_container_width' not in inspect.signature(st.image).parameters:
+    IMAGE_STRETCH = {'use_column_width': True}
 
 # ==================== FUNCTIONS ====================
 
@@ -223,66 +269,173 @@ def create_light_figure(figsize=(10, 4)):
     ax.spines['right'].set_linewidth(0.5)
     return fig, ax
 
-def process_audio(audio_data, sample_rate, target_freq):
-    """Process audio with DSP filters and detect frequency"""
+def show_figure(png):
+    """Show a rendered figure stretched to the width of its column"""
+    st.image(png, **IMAGE_STRETCH)
+
+@st.cache_resource(show_spinner=False)
+def get_disk_cache():
+    """Process-wide on-disk cache, or None when its directory is not writable"""
     try:
-        # Apply 50Hz notch filter
-        nyquist = sample_rate / 2
-        Q = 30
-        w0 = 50 / nyquist
-        b_notch, a_notch = signal.iirnotch(w0, Q, sample_rate)
-        
-        # Apply 500Hz lowpass filter
-        cutoff = 500 / nyquist
-        b_low, a_low = signal.butter(4, cutoff, btype='low', analog=False)
-        
-        # Filter the signal
-        temp = signal.filtfilt(b_notch, a_notch, audio_data)
-        filtered_audio = signal.filtfilt(b_low, a_low, temp)
-        
-        # Perform FFT
-        N = len(filtered_audio)
-        yf = fft(filtered_audio)
-        xf = fftfreq(N, 1/sample_rate)
-        
-        # Get positive frequencies
-        pos_mask = xf > 0
-        xf = xf[pos_mask]
-        yf = np.abs(yf[pos_mask])
-        
-        # Focus on guitar range
-        mask = (xf >= 70) & (xf <= 400)
-        freq_range = xf[mask]
-        mag_range = yf[mask]
-        
-        if len(mag_range) == 0:
-            return None, None, "No frequency detected in guitar range"
-        
-        # Find dominant frequency
-        peak_idx = np.argmax(mag_range)
-        dominant_freq = freq_range[peak_idx]
-        
-        return filtered_audio, dominant_freq, "Success"
-        
-    except Exception as e:
-        return None, None, str(e)
+        return DiskCache()
+    except (OSError, sqlite3.Error) as e:
+        logging.getLogger(__name__).warning("Disk cache disabled: %s", e)
+        return None
 
-def get_tuning_status(detected_freq, target_freq):
-    """Get tuning status"""
-    diff = detected_freq - target_freq
-    
-    if abs(diff) <= TUNE_TOLERANCE:
-        return "IN TUNE ✓", "success", "#00d084", "status-in-tune"
-    elif diff > 0:
-        return "SHARP ↑", "warning", "#ff6b6b", "status-sharp"
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_decoded_audio(upload_hash, _upload_bytes, max_seconds):
+    """Decoded upload (audio_data, sample_rate), decoded once per file content
+
+    Backed by the disk cache, so a restart does not decode a known file again.
+    """
+    return cached_load_audio(get_disk_cache(), upload_hash, _upload_bytes, max_seconds)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_magnitude_spectrum(content_hash, _audio_data, sample_rate):
+    """rfft magnitude spectrum, computed once per signal content"""
+    return cached_magnitude_spectrum(get_disk_cache(), content_hash, _audio_data, sample_rate)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_waveform_envelope(content_hash, _audio_data, sample_rate):
+    """Min/max plotting envelope, computed once per signal content"""
+    return waveform_envelope(_audio_data, sample_rate)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_hum_notches(content_hash, _audio_data, sample_rate, target_freq, tuning_name):
+    """(mains_freq, guard) of a clip's HumCanceller (mains_freq None without hum)
+
+    Estimated once per signal content, target and tuning.
+    """
+    hum = HumCanceller(sample_rate, target_freq, TUNINGS[tuning_name])
+    hum.retune(_audio_data)
+    return hum.mains_freq, hum.guard
+
+def has_filtered_audio():
+    """True when the filtered signal belongs to the currently loaded clip"""
+    return (st.session_state.filtered_audio is not None
+            and st.session_state.filtered_source == st.session_state.audio_hash)
+
+def get_spectrum_analysis():
+    """Raw and filtered spectra of the current clip, shared by the spectrum views"""
+    freqs, raw_magnitude = get_magnitude_spectrum(
+        st.session_state.audio_hash,
+        st.session_state.audio_data,
+        st.session_state.sample_rate
+    )
+    filtered_magnitude = None
+    if has_filtered_audio():
+        filtered_freqs, filtered_magnitude = get_magnitude_spectrum(
+            st.session_state.filtered_hash,
+            st.session_state.filtered_audio,
+            st.session_state.filtered_rate
+        )
+        if len(filtered_magnitude) != len(raw_magnitude):
+            # Decimated: same duration so same bin spacing, rescale to the
+            # full-rate sample count and leave the band above the working Nyquist empty
+            scale = len(st.session_state.audio_data) / len(st.session_state.filtered_audio)
+            filtered_magnitude = np.interp(freqs, filtered_freqs, filtered_magnitude * scale,
+                                           right=0.0)
+    return SpectrumAnalysis(freqs, raw_magnitude, filtered_magnitude)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_pitch_track(content_hash, _audio_data, sample_rate, method, prefiltered):
+    """Pitch track of a clip, computed once per (signal content, detector)"""
+    return track_pitch(_audio_data, sample_rate, method=method, prefiltered=prefiltered)
+
+def get_current_pitch_track(method):
+    """Pitch track of the filtered clip when there is one, else of the raw upload
+
+    Returns (content hash, audio, sample rate, track).
+    """
+    if has_filtered_audio():
+        source = (st.session_state.filtered_hash, st.session_state.filtered_audio,
+                  st.session_state.filtered_rate)
     else:
-        return "FLAT ↓", "info", "#4facfe", "status-flat"
+        source = (st.session_state.audio_hash, st.session_state.audio_data,
+                  st.session_state.sample_rate)
+    return (*source, get_pitch_track(*source, method, has_filtered_audio()))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_strobe_track(content_hash, _audio_data, sample_rate, reference_freq, start):
+    """Phase-vocoder strobe track of the audio from start seconds on"""
+    return estimate_phase_vocoder(_audio_data[int(start * sample_rate):], sample_rate,
+                                  reference_freq)
 
-def calculate_cents(detected_freq, target_freq):
-    """Calculate cents deviation"""
-    if detected_freq <= 0 or target_freq <= 0:
-        return 0
-    return 1200 * np.log2(detected_freq / target_freq)
+def render_strobe(detune_hz, phase, color):
+    """Concentric strobe rings turning at the detune, starting from the measured phase
+
+    Ring k follows the k-th partial, so it drifts k times faster: sharp turns
+    clockwise, flat anticlockwise, in tune stands still.
+    """
+    stripe_deg = 180 / STROBE_STRIPES
+    rings = []
+    for i, k in enumerate(STROBE_RINGS):
+        size, inset = 260 - 60 * i, 30 * i
+        drift = k * detune_hz
+        # One stripe pair passes per cycle of drift; faster than ~24 stripes/s just flickers
+        animation = 'none'
+        if abs(drift) > 1e-3:
+            period = max(STROBE_STRIPES / abs(drift), 1.0)
+            animation = f"strobeSpin {period:.3f}s linear infinite {'normal' if drift > 0 else 'reverse'}"
+        rings.append(f"""
+        <div style="position: absolute; top: {inset}px; left: {inset}px; width: {size}px; height: {size}px;
+                    border-radius: 50%; transform: rotate({(k * phase % 1) * 2 * stripe_deg:.2f}deg);">
+            <div style="width: 100%; height: 100%; border-radius: 50%; border: 2px solid #ffffff;
+                        background: repeating-conic-gradient({color} 0deg {stripe_deg}deg,
+                                    #ffffff {stripe_deg}deg {2 * stripe_deg}deg);
+                        animation: {animation};"></div>
+        </div>""")
+    return f"""
+    <div style="position: relative; width: 260px; height: 260px; margin: 1rem auto;">
+        {''.join(rings)}
+        <div style="position: absolute; top: 100px; left: 100px; width: 60px; height: 60px;
+                    border-radius: 50%; background: #ffffff; box-shadow: 0 4px 15px rgba(0,0,0,0.1);"></div>
+    </div>
+    """
+
+def render_live_status(reading):
+    """Build the live tuner status card"""
+    string_label = f"{reading.string.split(' (')[0]} &nbsp;|&nbsp; " if reading.string else ""
+    return f"""
+    <div style="padding: 1.5rem; border-radius: 20px; border-left: 6px solid {reading.status_color};
+                background: rgba(255,255,255,0.95); box-shadow: 0 8px 32px rgba(0, 0, 0, 0.12);
+                text-align: center;">
+        <h1 style="color: {reading.status_color}; margin: 0; font-size: 3rem; font-weight: 900;">
+            {reading.status_text}
+        </h1>
+        <p style="color: #4a4a4a; font-size: 1.4rem; margin: 0.8rem 0 0 0;">
+            {string_label}<strong>{reading.frequency:.2f} Hz</strong> (target {reading.target_freq:.2f} Hz)
+            &nbsp;|&nbsp; {reading.cents:+.1f} cents
+        </p>
+        <p style="color: #999; font-size: 0.9rem; margin: 0.5rem 0 0 0;">
+            Input level: {reading.level:.4f} RMS
+        </p>
+    </div>
+    """
+
+def run_live_tuner(source, tuner, placeholder):
+    """Update the live status card once per hop until the script is rerun
+
+    Hops without a pitch and waits without audio update the placeholder too:
+    Streamlit only stops the loop (and closes the stream) inside its own calls.
+    """
+    source.start(tuner.push)
+    try:
+        while True:
+            reading = None
+            if tuner.wait_for_hop(timeout=1.0):
+                reading = tuner.process_hop()
+            elif not source.active:
+                break
+            if reading is not None:
+                placeholder.markdown(
+                    render_live_status(reading),
+                    unsafe_allow_html=True
+                )
+            else:
+                placeholder.info(f"🎧 Listening… input level {tuner.level:.4f} RMS")
+    finally:
+        source.stop()
 
 # ==================== HEADER ====================
 st.markdown("""
@@ -299,14 +452,31 @@ with st.sidebar:
     
     # String Selection
     st.markdown("### 🎻 Select Guitar String")
+    tuning_name = st.selectbox("Tuning:", options=list(TUNINGS.keys()))
+    tuning = TUNINGS[tuning_name]
+    
+    auto_string = st.checkbox(
+        "🔍 Auto-detect string",
+        value=False,
+        help="Match the detected pitch to the nearest string of the tuning"
+    )
     selected_string = st.selectbox(
         "Choose string:",
-        options=list(STRING_FREQUENCIES.keys()),
-        index=5
+        options=list(tuning.keys()),
+        index=5,
+        disabled=auto_string
     )
     
-    target_freq = STRING_FREQUENCIES[selected_string]
-    string_color = STRING_COLORS[selected_string]
+    # In auto mode the last analysis decides which string is being tuned
+    if auto_string and st.session_state.dominant_freq:
+        selected_string, _, _ = identify_string(st.session_state.dominant_freq, tuning)
+    
+    target_freq = tuning[selected_string]
+    string_color = list(STRING_COLORS.values())[list(tuning).index(selected_string)]
+    target_label = (
+        f"🔍 {selected_string.split(' (')[0]}: {target_freq} Hz" if auto_string
+        else f"🎯 Target: {target_freq} Hz"
+    )
     
     st.markdown(f"""
     <div style="background: linear-gradient(135deg, {string_color}20 0%, {string_color}40 100%); 
@@ -314,7 +484,7 @@ with st.sidebar:
                 border-left: 6px solid {string_color}; 
                 margin: 1rem 0; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         <p style="color: {string_color}; font-weight: 800; font-size: 1.3rem; margin: 0;">
-            🎯 Target: {target_freq} Hz
+            {target_label}
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -329,37 +499,118 @@ with st.sidebar:
     )
     
     if uploaded_file is not None:
-        try:
-            with st.spinner("🔄 Loading audio..."):
-                audio_bytes = uploaded_file.read()
-                audio_data, sample_rate = librosa.load(
-                    io.BytesIO(audio_bytes), 
-                    sr=None, 
-                    mono=True
-                )
-                
-                # Limit to 5 seconds
-                max_samples = int(5 * sample_rate)
-                if len(audio_data) > max_samples:
-                    audio_data = audio_data[:max_samples]
-                
-                st.session_state.audio_data = audio_data
-                st.session_state.sample_rate = sample_rate
-                st.session_state.current_filename = uploaded_file.name
-                st.session_state.processing_complete = False
-                
-                duration = len(audio_data) / sample_rate
-                
-                st.success(f"""
-                ✅ **Audio Loaded!**
+        # Every rerun hands back the same upload: only new content is decoded,
+        # so the loaded clip and a finished analysis survive UI interaction
+        upload_bytes = uploaded_file.getvalue()
+        upload_hash = upload_fingerprint(upload_bytes)
+        
+        # st.cache_data does not cache exceptions, so a failed decode is remembered here
+        if upload_hash not in (st.session_state.upload_hash, st.session_state.failed_upload_hash):
+            try:
+                with st.spinner("🔄 Loading audio..."):
+                    # Decode only the first 5 seconds, however long the upload is
+                    decode_start = time.perf_counter()
+                    audio_data, sample_rate = get_decoded_audio(upload_hash, upload_bytes, MAX_DURATION)
+                    st.session_state.decode_ms = (time.perf_counter() - decode_start) * 1000
+                    
+                    st.session_state.audio_data = audio_data
+                    st.session_state.audio_hash = audio_fingerprint(audio_data)
+                    st.session_state.sample_rate = sample_rate
+                    st.session_state.current_filename = uploaded_file.name
+                    st.session_state.upload_hash = upload_hash
+                    
+                    # Results of the previous clip must not steer auto mode or the views
+                    st.session_state.processing_complete = False
+                    st.session_state.dominant_freq = None
+                    st.session_state.strum_readings = None
+                    st.session_state.filtered_audio = None
+                    st.session_state.filtered_hash = None
+                    st.session_state.filtered_rate = None
+                    st.session_state.filtered_source = None
                 
-                📄 {uploaded_file.name}  
-                🔊 {sample_rate:,} Hz  
-                ⏱️ {duration:.2f}s
-                """)
+            except Exception as e:
+                st.session_state.failed_upload_hash = upload_hash
+                st.session_state.upload_error = str(e)
+        
+        if upload_hash == st.session_state.failed_upload_hash:
+            st.error(f"❌ Error: {st.session_state.upload_error}")
+        elif upload_hash == st.session_state.upload_hash:
+            duration = len(st.session_state.audio_data) / st.session_state.sample_rate
             
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
+            st.success(f"""
+            ✅ **Audio Loaded!**
+            
+            📄 {uploaded_file.name}  
+            🔊 {st.session_state.sample_rate:,} Hz  
+            ⏱️ {duration:.2f}s
+            """)
+    
+    st.markdown("---")
+    
+    # Live Tuner
+    st.markdown("### 🎙️ Live Tuner")
+    live_source_name = st.radio(
+        "Live input:",
+        options=["Microphone", "Uploaded file (simulated)"],
+        horizontal=True
+    )
+    live_mode = st.toggle("Start live tuning", value=False)
+    
+    st.markdown("---")
+    
+    # Detection
+    st.markdown("### 🔬 Detection")
+    analysis_mode = st.radio(
+        "Analysis mode:",
+        options=["Single string", "Full strum"],
+        horizontal=True,
+        help="Full strum estimates all six strings from one strummed chord"
+    )
+    full_strum = analysis_mode == "Full strum"
+    detector_method = st.selectbox(
+        "Pitch detector:",
+        options=list(DETECTORS.keys()),
+        index=list(DETECTORS.keys()).index(DEFAULT_DETECTOR),
+        format_func=lambda name: DETECTORS[name].label,
+        help="YIN, HPS, autocorrelation and cepstrum resist locking onto the 2nd harmonic of low strings"
+    )
+    zoom_refine = st.checkbox(
+        "Chirp-z zoom peak refinement",
+        value=False,
+        help="Refine the interpolated FFT peak with a dense zoom around it"
+    )
+    decimate = st.checkbox(
+        f"Decimate to ~{DECIMATE_RATE // 1000} kHz before analysis",
+        value=False,
+        help="Anti-aliased polyphase decimation: filtering and FFT run at a fraction of the cost"
+    )
+    adaptive_hum = st.checkbox(
+        "Adaptive hum canceller",
+        value=False,
+        help="Measure the mains frequency (50 or 60 Hz) and notch it together with its harmonics"
+    )
+    target_band = st.checkbox(
+        "Target-band DFT",
+        value=False,
+        disabled=auto_string,
+        help="Only evaluate a few cents around the selected string and its harmonics; "
+             "the live tuner then updates a sliding DFT with just the new samples of each hop"
+    ) and not auto_string
+    segment = st.checkbox(
+        "Skip silence and pluck attacks",
+        value=False,
+        help="Split the clip at note onsets and only analyse the sustain of the longest-ringing note"
+    )
+    
+    st.markdown("---")
+    
+    # Display
+    st.markdown("### 🖥️ Display")
+    interactive_plots = st.toggle(
+        "Interactive charts",
+        value=False,
+        help="Draw charts in the browser (zoom and pan without a rerun) instead of server-side images"
+    )
     
     st.markdown("---")
     
@@ -371,28 +622,74 @@ with st.sidebar:
             with st.spinner("🔍 Analyzing..."):
                 progress_bar = st.progress(0)
                 
-                progress_bar.progress(25)
-                time.sleep(0.2)
+                # Plotting is timed on the rerun that draws the results
+                expected_stages = [stage for stage in ANALYSIS_STAGES if stage != 'plotting']
+                expected_stages.append('cache lookup')
+                if decimate:
+                    expected_stages.append('decimation')
+                if segment:
+                    expected_stages.append('segmentation')
+                if target_band:
+                    expected_stages.remove('fft')
+                    expected_stages.remove('peak search')
+                    expected_stages.append('band dft')
+                if full_strum:
+                    expected_stages.append('strum analysis')
                 
-                progress_bar.progress(50)
-                time.sleep(0.2)
+                def show_progress(stage, timer):
+                    done = len(timer.stages) / len(expected_stages)
+                    progress_bar.progress(min(done, 1.0), text=f"✅ {stage}")
                 
-                progress_bar.progress(75)
+                timer = StageTimer(on_stage=show_progress)
+                if st.session_state.decode_ms is not None:
+                    timer.add('decode', st.session_state.decode_ms)
                 
-                filtered_audio, dominant_freq, status = process_audio(
+                # A clip analysed before with the same settings comes from disk
+                filtered_audio, dominant_freq, status = cached_process_audio(
+                    get_disk_cache(),
+                    st.session_state.audio_hash,
                     st.session_state.audio_data,
                     st.session_state.sample_rate,
-                    target_freq
+                    # Unknown in auto mode; the hum notches then spare every string
+                    None if auto_string else target_freq,
+                    zoom=zoom_refine,
+                    method=detector_method,
+                    timer=timer,
+                    decimate=decimate,
+                    adaptive_hum=adaptive_hum,
+                    target_band=target_band,
+                    segment=segment,
+                    tuning=tuning
                 )
                 
-                progress_bar.progress(100)
-                time.sleep(0.2)
+                if status == "Success" and full_strum:
+                    with timer.stage('strum analysis'):
+                        strum_readings = analyze_strum(
+                            st.session_state.audio_data,
+                            st.session_state.sample_rate,
+                            tuning
+                        )
+                else:
+                    strum_readings = None
+                
                 progress_bar.empty()
+                timer.on_stage = None
                 
                 if status == "Success":
                     st.session_state.filtered_audio = filtered_audio
+                    st.session_state.filtered_hash = audio_fingerprint(filtered_audio)
+                    st.session_state.filtered_rate = st.session_state.sample_rate / (
+                        decimation_factor(st.session_state.sample_rate) if decimate else 1
+                    )
+                    st.session_state.filtered_source = st.session_state.audio_hash
                     st.session_state.dominant_freq = dominant_freq
                     st.session_state.processing_complete = True
+                    st.session_state.strum_readings = strum_readings
+                    st.session_state.perf_timer = timer
+                    st.session_state.perf_logged = False
+                    
+                    if auto_string:
+                        selected_string, target_freq, _ = identify_string(dominant_freq, tuning)
                     
                     diff = dominant_freq - target_freq
                     cents = calculate_cents(dominant_freq, target_freq)
@@ -411,6 +708,13 @@ with st.sidebar:
 
 # ==================== MAIN CONTENT ====================
 
+# Live Tuner (filled at the end of the script so the page renders first)
+if live_mode:
+    st.markdown("### 🎙️ Live Tuning")
+    live_placeholder = st.empty()
+    live_placeholder.info("🎧 Waiting for audio...")
+    st.markdown("---")
+
 # Audio Information
 if st.session_state.audio_data is not None:
     st.markdown("### 📊 Audio Information")
@@ -441,8 +745,45 @@ if st.session_state.audio_data is not None:
     
     st.markdown("---")
 
+# Full Strum Results
+if full_strum and st.session_state.strum_readings and st.session_state.processing_complete:
+    st.markdown("### 🎼 Full Strum Analysis")
+    
+    cols = st.columns(len(st.session_state.strum_readings))
+    for idx, reading in enumerate(st.session_state.strum_readings):
+        color = list(STRING_COLORS.values())[idx % len(STRING_COLORS)]
+        if np.isfinite(reading.frequency):
+            status_text, _, status_color, _ = get_tuning_status(reading.frequency, reading.target_freq)
+            if reading.confidence < STRUM_MIN_CONFIDENCE:
+                status_text, status_color = "UNCERTAIN", "#999"
+            detail = (f"{reading.frequency:.2f} Hz<br>{reading.cents:+.1f} cents"
+                      f"<br>{reading.confidence:.0%} confidence")
+        else:
+            status_text, status_color = "NOT FOUND", "#999"
+            detail = "--"
+        with cols[idx]:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, {color}20 0%, {color}40 100%); 
+                        padding: 1.2rem; border-radius: 15px; 
+                        border-left: 5px solid {color}; 
+                        text-align: center; margin: 0.5rem 0;
+                        box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+                <p style="color: {color}; font-weight: 800; margin: 0; font-size: 0.85rem;">
+                    {reading.string.split('(')[0]}
+                </p>
+                <p style="color: #4a4a4a; margin: 0.5rem 0; font-size: 1rem;">
+                    {detail}
+                </p>
+                <p style="color: {status_color}; margin: 0; font-size: 1.1rem; font-weight: 900;">
+                    {status_text}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+
 # Tuning Status
-if st.session_state.dominant_freq and st.session_state.processing_complete:
+if not full_strum and st.session_state.dominant_freq and st.session_state.processing_complete:
     status_text, status_type, status_color, status_class = get_tuning_status(
         st.session_state.dominant_freq,
         target_freq
@@ -451,6 +792,9 @@ if st.session_state.dominant_freq and st.session_state.processing_complete:
     diff = st.session_state.dominant_freq - target_freq
     cents = calculate_cents(st.session_state.dominant_freq, target_freq)
     
+    if auto_string:
+        st.info(f"🔍 Detected string: **{selected_string}** ({target_freq} Hz, {tuning_name} tuning)")
+    
     if "IN TUNE" in status_text:
         instruction = "🎉 Perfect! Your string is tuned!"
         emoji = "✅"
@@ -491,43 +835,68 @@ if st.session_state.dominant_freq and st.session_state.processing_complete:
 if st.session_state.audio_data is not None:
     st.markdown("### 📊 Visualizations")
     
-    tabs = st.tabs([
+    perf_timer = st.session_state.perf_timer if st.session_state.processing_complete else None
+    if perf_timer is not None:
+        perf_timer.stages.pop('plotting', None)
+        perf_timer.start('plotting')
+    
+    # Only the selected view is computed and drawn (st.tabs would run every tab body)
+    views = [
         "🌊 Waveform",
         "📊 Spectrum",
         "📈 FFT Before",
         "📉 FFT After",
         "🔧 Filters",
-        "🎯 Tuning Meter"
-    ])
+        "🎯 Tuning Meter",
+        "📈 Pitch Track",
+        "🌀 Strobe"
+    ]
+    view = st.radio(
+        "View:",
+        options=views,
+        horizontal=True,
+        key='visualization_view',
+        label_visibility='collapsed'
+    )
     
-    # TAB 1: Waveform
-    with tabs[0]:
+    spectrum = get_spectrum_analysis() if view in views[1:4] else None
+    
+    # VIEW 1: Waveform
+    if view == views[0]:
         st.markdown("#### 🌊 Time Domain Waveform")
         
-        fig, ax = create_light_figure(figsize=(12, 5))
-        
-        time_array = np.linspace(
-            0, 
-            len(st.session_state.audio_data) / st.session_state.sample_rate, 
-            len(st.session_state.audio_data)
+        # Whole clip as a fixed number of min/max buckets
+        time_array, lower, upper = get_waveform_envelope(
+            st.session_state.audio_hash,
+            st.session_state.audio_data,
+            st.session_state.sample_rate
         )
         
-        samples = min(20000, len(st.session_state.audio_data))
-        
-        ax.plot(time_array[:samples], st.session_state.audio_data[:samples], 
-               color=string_color, linewidth=1, alpha=0.7)
-        ax.fill_between(time_array[:samples], st.session_state.audio_data[:samples], 
-                       alpha=0.2, color=string_color)
-        
-        ax.set_title(f'Waveform - {selected_string}', color='#667eea', 
-                    fontsize=14, fontweight='bold', pad=15)
-        ax.set_xlabel('Time (s)', color='#4a4a4a', fontsize=11)
-        ax.set_ylabel('Amplitude', color='#4a4a4a', fontsize=11)
-        ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
-        ax.axhline(y=0, color='#999', linestyle='-', linewidth=0.8, alpha=0.5)
-        
-        st.pyplot(fig)
-        plt.close()
+        if interactive_plots:
+            st.vega_lite_chart(
+                waveform_chart(time_array, lower, upper, string_color, f'Waveform - {selected_string}'),
+                use_container_width=True
+            )
+        else:
+            figure_key = ('waveform', st.session_state.audio_hash, selected_string, string_color)
+            png = FIGURE_CACHE.get(figure_key)
+            if png is None:
+                fig, ax = create_light_figure(figsize=(12, 5))
+                
+                ax.fill_between(time_array, lower, upper, color=string_color, alpha=0.35, linewidth=0)
+                ax.plot(time_array, upper, color=string_color, linewidth=0.6, alpha=0.7)
+                ax.plot(time_array, lower, color=string_color, linewidth=0.6, alpha=0.7)
+                ax.set_xlim([0, len(st.session_state.audio_data) / st.session_state.sample_rate])
+                
+                ax.set_title(f'Waveform - {selected_string}', color='#667eea', 
+                            fontsize=14, fontweight='bold', pad=15)
+                ax.set_xlabel('Time (s)', color='#4a4a4a', fontsize=11)
+                ax.set_ylabel('Amplitude', color='#4a4a4a', fontsize=11)
+                ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                ax.axhline(y=0, color='#999', linestyle='-', linewidth=0.8, alpha=0.5)
+                
+                png = FIGURE_CACHE.put(figure_key, fig)
+            show_figure(png)
         
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Max", f"{np.max(st.session_state.audio_data):.4f}")
@@ -535,163 +904,220 @@ if st.session_state.audio_data is not None:
         col3.metric("Mean", f"{np.mean(st.session_state.audio_data):.4f}")
         col4.metric("RMS", f"{np.sqrt(np.mean(st.session_state.audio_data**2)):.4f}")
     
-    # TAB 2: Spectrum
-    with tabs[1]:
+    # VIEW 2: Spectrum
+    if view == views[1]:
         st.markdown("#### 📊 Frequency Spectrum")
         
-        fig, ax = create_light_figure(figsize=(12, 5))
-        
-        N = len(st.session_state.audio_data)
-        yf = fft(st.session_state.audio_data)
-        xf = fftfreq(N, 1/st.session_state.sample_rate)
-        
-        pos_mask = xf > 0
-        xf = xf[pos_mask]
-        yf = np.abs(yf[pos_mask])
-        
-        ax.plot(xf, yf, color='#667eea', linewidth=1.2, alpha=0.8)
-        ax.fill_between(xf, yf, alpha=0.2, color='#667eea')
-        
-        ax.axvline(target_freq, color='#00d084', linestyle='--', linewidth=2,
-                  label=f'Target: {target_freq:.2f} Hz', alpha=0.8)
-        
-        if st.session_state.dominant_freq:
-            ax.axvline(st.session_state.dominant_freq, color='#ff6b6b', 
-                      linestyle='--', linewidth=2,
-                      label=f'Detected: {st.session_state.dominant_freq:.2f} Hz', alpha=0.8)
-        
-        ax.set_xlim([0, 1000])
-        ax.set_title('Frequency Spectrum', color='#667eea', fontsize=14, fontweight='bold', pad=15)
-        ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
-        ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
-        ax.legend(loc='upper right', framealpha=0.9)
-        ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
-        
-        st.pyplot(fig)
-        plt.close()
+        if interactive_plots:
+            markers = [(target_freq, '#00d084', f'Target: {target_freq:.2f} Hz')]
+            if st.session_state.dominant_freq:
+                markers.append((st.session_state.dominant_freq, '#ff6b6b',
+                                f'Detected: {st.session_state.dominant_freq:.2f} Hz'))
+            st.vega_lite_chart(
+                spectrum_chart(spectrum.freqs, spectrum.raw_magnitude, '#667eea',
+                               'Frequency Spectrum', 1000, markers=markers),
+                use_container_width=True
+            )
+        else:
+            figure_key = ('spectrum', st.session_state.audio_hash, target_freq,
+                          st.session_state.dominant_freq)
+            png = FIGURE_CACHE.get(figure_key)
+            if png is None:
+                fig, ax = create_light_figure(figsize=(12, 5))
+                
+                xf = spectrum.freqs
+                yf = spectrum.raw_magnitude
+                
+                ax.plot(xf, yf, color='#667eea', linewidth=1.2, alpha=0.8)
+                ax.fill_between(xf, yf, alpha=0.2, color='#667eea')
+                
+                ax.axvline(target_freq, color='#00d084', linestyle='--', linewidth=2,
+                          label=f'Target: {target_freq:.2f} Hz', alpha=0.8)
+                
+                if st.session_state.dominant_freq:
+                    ax.axvline(st.session_state.dominant_freq, color='#ff6b6b', 
+                              linestyle='--', linewidth=2,
+                              label=f'Detected: {st.session_state.dominant_freq:.2f} Hz', alpha=0.8)
+                
+                ax.set_xlim([0, 1000])
+                ax.set_title('Frequency Spectrum', color='#667eea', fontsize=14, fontweight='bold', pad=15)
+                ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
+                ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
+                ax.legend(loc='upper right', framealpha=0.9)
+                ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                
+                png = FIGURE_CACHE.put(figure_key, fig)
+            show_figure(png)
     
-    # TAB 3: FFT Before
-    with tabs[2]:
+    # VIEW 3: FFT Before
+    if view == views[2]:
         st.markdown("#### 📈 FFT Before Filtering")
         
-        fig, ax = create_light_figure(figsize=(12, 5))
-        
-        N = len(st.session_state.audio_data)
-        yf = fft(st.session_state.audio_data)
-        xf = fftfreq(N, 1/st.session_state.sample_rate)
-        
-        pos_mask = xf > 0
-        xf = xf[pos_mask]
-        yf = np.abs(yf[pos_mask])
-        
-        ax.plot(xf, yf, color='#ff6b6b', linewidth=1.2, alpha=0.8)
-        ax.fill_between(xf, yf, alpha=0.15, color='#ff6b6b')
-        ax.set_xlim([0, 600])
-        
-        ax.axvline(50, color='#ffd93d', linestyle=':', linewidth=3, 
-                  label='50 Hz Noise', alpha=0.7)
-        ax.axvspan(70, 400, alpha=0.1, color='#6bcf7f', label='Guitar Range')
-        
-        ax.set_title('Unfiltered Spectrum', color='#ff6b6b', fontsize=14, fontweight='bold', pad=15)
-        ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
-        ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
-        ax.legend(loc='upper right', framealpha=0.9)
-        ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
-        
-        st.pyplot(fig)
-        plt.close()
+        if interactive_plots:
+            st.vega_lite_chart(
+                spectrum_chart(spectrum.freqs, spectrum.raw_magnitude, '#ff6b6b',
+                               'Unfiltered Spectrum', 600,
+                               markers=[(50, '#ffd93d', '50 Hz Noise')],
+                               bands=[(70, 400, '#6bcf7f', 'Guitar Range')]),
+                use_container_width=True
+            )
+        else:
+            figure_key = ('fft_before', st.session_state.audio_hash)
+            png = FIGURE_CACHE.get(figure_key)
+            if png is None:
+                fig, ax = create_light_figure(figsize=(12, 5))
+                
+                xf = spectrum.freqs
+                yf = spectrum.raw_magnitude
+                
+                ax.plot(xf, yf, color='#ff6b6b', linewidth=1.2, alpha=0.8)
+                ax.fill_between(xf, yf, alpha=0.15, color='#ff6b6b')
+                ax.set_xlim([0, 600])
+                
+                ax.axvline(50, color='#ffd93d', linestyle=':', linewidth=3, 
+                          label='50 Hz Noise', alpha=0.7)
+                ax.axvspan(70, 400, alpha=0.1, color='#6bcf7f', label='Guitar Range')
+                
+                ax.set_title('Unfiltered Spectrum', color='#ff6b6b', fontsize=14, fontweight='bold', pad=15)
+                ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
+                ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
+                ax.legend(loc='upper right', framealpha=0.9)
+                ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                
+                png = FIGURE_CACHE.put(figure_key, fig)
+            show_figure(png)
         
         st.warning("⚠️ Raw signal contains 50 Hz interference and noise")
     
-    # TAB 4: FFT After
-    with tabs[3]:
-        if st.session_state.filtered_audio is not None:
+    # VIEW 4: FFT After
+    if view == views[3]:
+        if spectrum.filtered_magnitude is not None:
             st.markdown("#### 📉 FFT After Filtering")
             
-            fig, ax = create_light_figure(figsize=(12, 5))
-            
-            N = len(st.session_state.filtered_audio)
-            yf = fft(st.session_state.filtered_audio)
-            xf = fftfreq(N, 1/st.session_state.sample_rate)
-            
-            pos_mask = xf > 0
-            xf = xf[pos_mask]
-            yf = np.abs(yf[pos_mask])
-            
-            ax.plot(xf, yf, color='#00d084', linewidth=1.2, alpha=0.8)
-            ax.fill_between(xf, yf, alpha=0.2, color='#00d084')
-            ax.set_xlim([0, 600])
-            
-            if st.session_state.dominant_freq:
-                ax.axvline(st.session_state.dominant_freq, color='#667eea', 
-                          linestyle='--', linewidth=2.5,
-                          label=f'Peak: {st.session_state.dominant_freq:.2f} Hz', alpha=0.8)
-                
-                peak_idx = np.argmin(np.abs(xf - st.session_state.dominant_freq))
-                ax.plot(xf[peak_idx], yf[peak_idx], 'r*', markersize=20, label='Peak')
-            
-            ax.axvspan(70, 400, alpha=0.1, color='#6bcf7f', label='Guitar Range')
-            
-            ax.set_title('Filtered Spectrum', color='#00d084', fontsize=14, fontweight='bold', pad=15)
-            ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
-            ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
-            ax.legend(loc='upper right', framealpha=0.9)
-            ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
-            
-            st.pyplot(fig)
-            plt.close()
+            if interactive_plots:
+                markers = []
+                if st.session_state.dominant_freq:
+                    markers.append((st.session_state.dominant_freq, '#667eea',
+                                    f'Peak: {st.session_state.dominant_freq:.2f} Hz'))
+                st.vega_lite_chart(
+                    spectrum_chart(spectrum.freqs, spectrum.filtered_magnitude, '#00d084',
+                                   'Filtered Spectrum', 600, markers=markers,
+                                   bands=[(70, 400, '#6bcf7f', 'Guitar Range')]),
+                    use_container_width=True
+                )
+            else:
+                figure_key = ('fft_after', st.session_state.filtered_hash, st.session_state.dominant_freq)
+                png = FIGURE_CACHE.get(figure_key)
+                if png is None:
+                    fig, ax = create_light_figure(figsize=(12, 5))
+                    
+                    xf = spectrum.freqs
+                    yf = spectrum.filtered_magnitude
+                    
+                    ax.plot(xf, yf, color='#00d084', linewidth=1.2, alpha=0.8)
+                    ax.fill_between(xf, yf, alpha=0.2, color='#00d084')
+                    ax.set_xlim([0, 600])
+                    
+                    if st.session_state.dominant_freq:
+                        ax.axvline(st.session_state.dominant_freq, color='#667eea', 
+                                  linestyle='--', linewidth=2.5,
+                                  label=f'Peak: {st.session_state.dominant_freq:.2f} Hz', alpha=0.8)
+                        
+                        peak_idx = np.argmin(np.abs(xf - st.session_state.dominant_freq))
+                        ax.plot(xf[peak_idx], yf[peak_idx], 'r*', markersize=20, label='Peak')
+                    
+                    ax.axvspan(70, 400, alpha=0.1, color='#6bcf7f', label='Guitar Range')
+                    
+                    ax.set_title('Filtered Spectrum', color='#00d084', fontsize=14, fontweight='bold', pad=15)
+                    ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
+                    ax.set_ylabel('Magnitude', color='#4a4a4a', fontsize=11)
+                    ax.legend(loc='upper right', framealpha=0.9)
+                    ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                    
+                    png = FIGURE_CACHE.put(figure_key, fig)
+                show_figure(png)
             
-            st.success("✅ Filters: 50 Hz Notch + 500 Hz Lowpass applied!")
+            notch_name = "Adaptive Hum Notches" if adaptive_hum else "50 Hz Notch"
+            st.success(f"✅ Filters: {notch_name} + 500 Hz Lowpass applied!")
         else:
             st.warning("⚠️ Please run 'ANALYZE & TUNE' first")
     
-    # TAB 5: Filter Response
-    with tabs[4]:
+    # VIEW 5: Filter Response
+    if view == views[4]:
         st.markdown("#### 🔧 Filter Frequency Response")
         
-        fig, ax = create_light_figure(figsize=(12, 5))
-        
-        nyquist = st.session_state.sample_rate / 2
-        Q = 30
-        w0 = 50 / nyquist
-        b_notch, a_notch = signal.iirnotch(w0, Q, st.session_state.sample_rate)
-        
-        cutoff = 500 / nyquist
-        b_low, a_low = signal.butter(4, cutoff, btype='low', analog=False)
-        
-        w_notch, h_notch = signal.freqz(b_notch, a_notch, worN=4000, fs=st.session_state.sample_rate)
-        w_low, h_low = signal.freqz(b_low, a_low, worN=4000, fs=st.session_state.sample_rate)
+        # Same cached design the analysis uses; freqz runs once per sample rate
+        w_response, notch_db, low_db = FILTER_BANK.get(st.session_state.sample_rate).response
+        notch_label, notch_freq = '50 Hz Notch', 50
         
-        ax.plot(w_notch, 20*np.log10(abs(h_notch)), color='#ffd93d', 
-               label='50 Hz Notch', linewidth=2.5, alpha=0.9)
-        ax.plot(w_low, 20*np.log10(abs(h_low)), color='#00d084', 
-               label='500 Hz Lowpass', linewidth=2.5, alpha=0.9)
-        ax.set_xlim([0, 1000])
-        ax.set_ylim([-80, 5])
-        
-        ax.axvline(50, color='#ff6b6b', linestyle=':', alpha=0.5, linewidth=2)
-        ax.axvline(500, color='#4facfe', linestyle=':', alpha=0.5, linewidth=2)
-        ax.axhline(-3, color='gray', linestyle='--', alpha=0.3, linewidth=1)
-        
-        ax.set_title('Filter Response', color='#667eea', fontsize=14, fontweight='bold', pad=15)
-        ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
-        ax.set_ylabel('Gain (dB)', color='#4a4a4a', fontsize=11)
-        ax.legend(loc='lower right', framealpha=0.9)
-        ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+        mains_freq, hum_guard = None, ()
+        if adaptive_hum:
+            mains_freq, hum_guard = get_hum_notches(
+                st.session_state.audio_hash,
+                st.session_state.audio_data,
+                st.session_state.sample_rate,
+                None if auto_string else target_freq,
+                tuning_name
+            )
+        if mains_freq is not None:
+            _, notch_db = hum_notch_response(st.session_state.sample_rate, mains_freq, hum_guard)
+            notch_label, notch_freq = f'Hum Notches ({mains_freq:.2f} Hz)', mains_freq
         
-        st.pyplot(fig)
-        plt.close()
+        if interactive_plots:
+            st.vega_lite_chart(
+                response_chart(
+                    w_response,
+                    [(notch_db, '#ffd93d', notch_label), (low_db, '#00d084', '500 Hz Lowpass')],
+                    'Filter Response', 1000, (-80, 5),
+                    markers=[(notch_freq, '#ff6b6b', None), (500, '#4facfe', None)]
+                ),
+                use_container_width=True
+            )
+        else:
+            figure_key = ('filters', st.session_state.sample_rate, notch_label, hum_guard)
+            png = FIGURE_CACHE.get(figure_key)
+            if png is None:
+                fig, ax = create_light_figure(figsize=(12, 5))
+                
+                ax.plot(w_response, notch_db, color='#ffd93d', 
+                       label=notch_label, linewidth=2.5, alpha=0.9)
+                ax.plot(w_response, low_db, color='#00d084', 
+                       label='500 Hz Lowpass', linewidth=2.5, alpha=0.9)
+                ax.set_xlim([0, 1000])
+                ax.set_ylim([-80, 5])
+                
+                ax.axvline(notch_freq, color='#ff6b6b', linestyle=':', alpha=0.5, linewidth=2)
+                ax.axvline(500, color='#4facfe', linestyle=':', alpha=0.5, linewidth=2)
+                ax.axhline(-3, color='gray', linestyle='--', alpha=0.3, linewidth=1)
+                
+                ax.set_title('Filter Response', color='#667eea', fontsize=14, fontweight='bold', pad=15)
+                ax.set_xlabel('Frequency (Hz)', color='#4a4a4a', fontsize=11)
+                ax.set_ylabel('Gain (dB)', color='#4a4a4a', fontsize=11)
+                ax.legend(loc='lower right', framealpha=0.9)
+                ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                
+                png = FIGURE_CACHE.put(figure_key, fig)
+            show_figure(png)
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-            **🔸 Notch Filter:**
-            - Type: IIR Notch
-            - Center: 50 Hz
-            - Q Factor: 30
-            - Purpose: Remove power line noise
-            """)
+            if mains_freq is not None:
+                st.markdown(f"""
+                **🔸 Hum Canceller:**
+                - Type: IIR Notch bank
+                - Mains: {mains_freq:.2f} Hz (measured) + {HUM_HARMONICS - 1} harmonics
+                - Width: {HUM_BANDWIDTH:g} Hz per notch
+                - Purpose: Remove power line hum
+                """)
+            else:
+                st.markdown("""
+                **🔸 Notch Filter:**
+                - Type: IIR Notch
+                - Center: 50 Hz
+                - Q Factor: 30
+                - Purpose: Remove power line noise
+                """)
         
         with col2:
             st.markdown("""
@@ -702,14 +1128,11 @@ if st.session_state.audio_data is not None:
             - Purpose: Remove high-freq noise
             """)
     
-    # TAB 6: Tuning Meter
-    with tabs[5]:
+    # VIEW 6: Tuning Meter
+    if view == views[5]:
         if st.session_state.dominant_freq and st.session_state.processing_complete:
             st.markdown("#### 🎯 Professional Tuning Meter")
             
-            fig, ax = create_light_figure(figsize=(14, 8))
-            ax.axis('off')
-            
             detected_freq = st.session_state.dominant_freq
             diff = detected_freq - target_freq
             cents = calculate_cents(detected_freq, target_freq)
@@ -724,128 +1147,140 @@ if st.session_state.audio_data is not None:
                 status = "FLAT ↓"
                 color = '#4facfe'
             
-            # Draw meter
-            meter_width = 0.7
-            meter_height = 0.15
-            meter_x = 0.15
-            meter_y = 0.45
-            
-            # Background
-            bg_rect = FancyBboxPatch(
-                (meter_x, meter_y), meter_width, meter_height,
-                boxstyle="round,pad=0.01",
-                facecolor='#f0f0f0',
-                edgecolor='#c0c0c0',
-                linewidth=3
-            )
-            ax.add_patch(bg_rect)
-            
-            # Color zones
-            flat_rect = Rectangle(
-                (meter_x, meter_y), meter_width*0.35, meter_height,
-                facecolor='#4facfe', alpha=0.3
-            )
-            ax.add_patch(flat_rect)
-            
-            intune_rect = Rectangle(
-                (meter_x + meter_width*0.35, meter_y), meter_width*0.3, meter_height,
-                facecolor='#00d084', alpha=0.3
-            )
-            ax.add_patch(intune_rect)
-            
-            sharp_rect = Rectangle(
-                (meter_x + meter_width*0.65, meter_y), meter_width*0.35, meter_height,
-                facecolor='#ff6b6b', alpha=0.3
-            )
-            ax.add_patch(sharp_rect)
-            
-            # Needle
-            max_diff = 10
-            needle_pos = np.clip(diff / max_diff, -1, 1)
-            needle_x = meter_x + meter_width/2 + (needle_pos * meter_width/2 * 0.9)
-            
-            # Needle shadow
-            ax.plot([needle_x + 0.005, needle_x + 0.005], [meter_y, meter_y + meter_height], 
-                   color='black', linewidth=7, alpha=0.2)
-            
-            # Needle
-            ax.plot([needle_x, needle_x], [meter_y, meter_y + meter_height], 
-                   color=color, linewidth=8, alpha=0.9, solid_capstyle='round')
-            ax.plot([needle_x], [meter_y + meter_height + 0.04], 
-                   marker='v', markersize=30, color=color, markeredgecolor='white', 
-                   markeredgewidth=2)
-            
-            # Center line
-            center_x = meter_x + meter_width/2
-            ax.plot([center_x, center_x], [meter_y, meter_y + meter_height], 
-                   color='white', linewidth=3, alpha=0.8, linestyle='--')
-            
-            # Text info
-            ax.text(0.5, 0.88, f"🎸 {selected_string}", 
-                   ha='center', va='center', fontsize=18, color='#667eea', fontweight='bold')
-            
-            ax.text(0.5, 0.78, f"Target: {target_freq:.2f} Hz", 
-                   ha='center', va='center', fontsize=14, color='#999', fontweight='600')
-            ax.text(0.5, 0.72, f"Detected: {detected_freq:.2f} Hz", 
-                   ha='center', va='center', fontsize=16, color='#4a4a4a', fontweight='bold')
-            
-            ax.text(0.5, 0.65, f"Δ {diff:+.2f} Hz  |  {cents:+.1f} cents", 
-                   ha='center', va='center', fontsize=13, color=color, fontweight='bold')
-            
-            # Zone labels
-            ax.text(meter_x + 0.02, meter_y - 0.05, "FLAT", 
-                   ha='left', va='top', fontsize=11, color='#4facfe', fontweight='bold')
-            ax.text(center_x, meter_y - 0.05, "IN TUNE", 
-                   ha='center', va='top', fontsize=11, color='#00d084', fontweight='bold')
-            ax.text(meter_x + meter_width - 0.02, meter_y - 0.05, "SHARP", 
-                   ha='right', va='top', fontsize=11, color='#ff6b6b', fontweight='bold')
-            
-            # Status box
-            status_box = dict(
-                boxstyle='round,pad=1.2', 
-                facecolor='white', 
-                edgecolor=color, 
-                linewidth=6,
-                alpha=0.95
-            )
-            ax.text(0.5, 0.25, status, 
-                   ha='center', va='center', fontsize=32, color=color, 
-                   fontweight='bold', bbox=status_box)
-            
-            # Instructions
-            if "SHARP" in status:
-                instruction = "⬇️ Loosen string (counter-clockwise)"
-                inst_color = '#ff6b6b'
-            elif "FLAT" in status:
-                instruction = "⬆️ Tighten string (clockwise)"
-                inst_color = '#4facfe'
+            if interactive_plots:
+                st.vega_lite_chart(
+                    tuning_meter_chart(diff, 10, TUNE_TOLERANCE, color, status),
+                    use_container_width=True
+                )
             else:
-                instruction = "✓ Perfect tune!"
-                inst_color = '#00d084'
-            
-            ax.text(0.5, 0.12, instruction, 
-                   ha='center', va='center', fontsize=12, color=inst_color, 
-                   style='italic', fontweight='600')
-            
-            # Frequency scale
-            scale_y = meter_y - 0.15
-            scale_freqs = [-10, -5, 0, 5, 10]
-            for sf in scale_freqs:
-                scale_x = meter_x + meter_width/2 + (sf/10 * meter_width/2 * 0.9)
-                ax.plot([scale_x, scale_x], [scale_y, scale_y + 0.03], 
-                       color='#999', linewidth=2)
-                ax.text(scale_x, scale_y - 0.02, f"{sf:+d}", 
-                       ha='center', va='top', fontsize=9, color='#666', fontweight='600')
-            
-            ax.text(0.5, scale_y - 0.08, "Frequency Deviation (Hz)", 
-                   ha='center', va='top', fontsize=10, color='#999', 
-                   style='italic', fontweight='600')
-            
-            ax.set_xlim([0, 1])
-            ax.set_ylim([0, 1])
-            
-            st.pyplot(fig)
-            plt.close()
+                figure_key = ('tuning_meter', detected_freq, target_freq, selected_string)
+                png = FIGURE_CACHE.get(figure_key)
+                if png is None:
+                    fig, ax = create_light_figure(figsize=(14, 8))
+                    ax.axis('off')
+                    
+                    # Draw meter
+                    meter_width = 0.7
+                    meter_height = 0.15
+                    meter_x = 0.15
+                    meter_y = 0.45
+                    
+                    # Background
+                    bg_rect = FancyBboxPatch(
+                        (meter_x, meter_y), meter_width, meter_height,
+                        boxstyle="round,pad=0.01",
+                        facecolor='#f0f0f0',
+                        edgecolor='#c0c0c0',
+                        linewidth=3
+                    )
+                    ax.add_patch(bg_rect)
+                    
+                    # Color zones
+                    flat_rect = Rectangle(
+                        (meter_x, meter_y), meter_width*0.35, meter_height,
+                        facecolor='#4facfe', alpha=0.3
+                    )
+                    ax.add_patch(flat_rect)
+                    
+                    intune_rect = Rectangle(
+                        (meter_x + meter_width*0.35, meter_y), meter_width*0.3, meter_height,
+                        facecolor='#00d084', alpha=0.3
+                    )
+                    ax.add_patch(intune_rect)
+                    
+                    sharp_rect = Rectangle(
+                        (meter_x + meter_width*0.65, meter_y), meter_width*0.35, meter_height,
+                        facecolor='#ff6b6b', alpha=0.3
+                    )
+                    ax.add_patch(sharp_rect)
+                    
+                    # Needle
+                    max_diff = 10
+                    needle_pos = np.clip(diff / max_diff, -1, 1)
+                    needle_x = meter_x + meter_width/2 + (needle_pos * meter_width/2 * 0.9)
+                    
+                    # Needle shadow
+                    ax.plot([needle_x + 0.005, needle_x + 0.005], [meter_y, meter_y + meter_height], 
+                           color='black', linewidth=7, alpha=0.2)
+                    
+                    # Needle
+                    ax.plot([needle_x, needle_x], [meter_y, meter_y + meter_height], 
+                           color=color, linewidth=8, alpha=0.9, solid_capstyle='round')
+                    ax.plot([needle_x], [meter_y + meter_height + 0.04], 
+                           marker='v', markersize=30, color=color, markeredgecolor='white', 
+                           markeredgewidth=2)
+                    
+                    # Center line
+                    center_x = meter_x + meter_width/2
+                    ax.plot([center_x, center_x], [meter_y, meter_y + meter_height], 
+                           color='white', linewidth=3, alpha=0.8, linestyle='--')
+                    
+                    # Text info
+                    ax.text(0.5, 0.88, f"🎸 {selected_string}", 
+                           ha='center', va='center', fontsize=18, color='#667eea', fontweight='bold')
+                    
+                    ax.text(0.5, 0.78, f"Target: {target_freq:.2f} Hz", 
+                           ha='center', va='center', fontsize=14, color='#999', fontweight='600')
+                    ax.text(0.5, 0.72, f"Detected: {detected_freq:.2f} Hz", 
+                           ha='center', va='center', fontsize=16, color='#4a4a4a', fontweight='bold')
+                    
+                    ax.text(0.5, 0.65, f"Δ {diff:+.2f} Hz  |  {cents:+.1f} cents", 
+                           ha='center', va='center', fontsize=13, color=color, fontweight='bold')
+                    
+                    # Zone labels
+                    ax.text(meter_x + 0.02, meter_y - 0.05, "FLAT", 
+                           ha='left', va='top', fontsize=11, color='#4facfe', fontweight='bold')
+                    ax.text(center_x, meter_y - 0.05, "IN TUNE", 
+                           ha='center', va='top', fontsize=11, color='#00d084', fontweight='bold')
+                    ax.text(meter_x + meter_width - 0.02, meter_y - 0.05, "SHARP", 
+                           ha='right', va='top', fontsize=11, color='#ff6b6b', fontweight='bold')
+                    
+                    # Status box
+                    status_box = dict(
+                        boxstyle='round,pad=1.2', 
+                        facecolor='white', 
+                        edgecolor=color, 
+                        linewidth=6,
+                        alpha=0.95
+                    )
+                    ax.text(0.5, 0.25, status, 
+                           ha='center', va='center', fontsize=32, color=color, 
+                           fontweight='bold', bbox=status_box)
+                    
+                    # Instructions
+                    if "SHARP" in status:
+                        instruction = "⬇️ Loosen string (counter-clockwise)"
+                        inst_color = '#ff6b6b'
+                    elif "FLAT" in status:
+                        instruction = "⬆️ Tighten string (clockwise)"
+                        inst_color = '#4facfe'
+                    else:
+                        instruction = "✓ Perfect tune!"
+                        inst_color = '#00d084'
+                    
+                    ax.text(0.5, 0.12, instruction, 
+                           ha='center', va='center', fontsize=12, color=inst_color, 
+                           style='italic', fontweight='600')
+                    
+                    # Frequency scale
+                    scale_y = meter_y - 0.15
+                    scale_freqs = [-10, -5, 0, 5, 10]
+                    for sf in scale_freqs:
+                        scale_x = meter_x + meter_width/2 + (sf/10 * meter_width/2 * 0.9)
+                        ax.plot([scale_x, scale_x], [scale_y, scale_y + 0.03], 
+                               color='#999', linewidth=2)
+                        ax.text(scale_x, scale_y - 0.02, f"{sf:+d}", 
+                               ha='center', va='top', fontsize=9, color='#666', fontweight='600')
+                    
+                    ax.text(0.5, scale_y - 0.08, "Frequency Deviation (Hz)", 
+                           ha='center', va='top', fontsize=10, color='#999', 
+                           style='italic', fontweight='600')
+                    
+                    ax.set_xlim([0, 1])
+                    ax.set_ylim([0, 1])
+                    
+                    png = FIGURE_CACHE.put(figure_key, fig)
+                show_figure(png)
             
             # Metrics
             st.markdown("##### 📊 Tuning Metrics")
@@ -871,6 +1306,174 @@ if st.session_state.audio_data is not None:
         else:
             st.warning("⚠️ Please run '⚡ ANALYZE & TUNE ⚡' first!")
             st.info("💡 The tuning meter shows visual feedback on how sharp or flat your string is.")
+    
+    # VIEW 7: Pitch Track
+    if view == views[6]:
+        st.markdown("#### 📈 Pitch Over Time")
+        
+        track_source, _, _, track = get_current_pitch_track(detector_method)
+        track = with_target(track, target_freq)
+        voiced = voiced_frames(track)
+        sustained = sustained_pitch(track)
+        
+        tolerance_low = calculate_cents(target_freq - TUNE_TOLERANCE, target_freq)
+        tolerance_high = calculate_cents(target_freq + TUNE_TOLERANCE, target_freq)
+        limit = 20
+        if voiced.any():
+            limit = max(20, min(1200, 1.2 * np.nanmax(np.abs(track.cents[voiced]))))
+        duration = len(st.session_state.audio_data) / st.session_state.sample_rate
+        
+        if interactive_plots:
+            st.vega_lite_chart(
+                pitch_track_chart(track.times[voiced], track.cents[voiced], string_color,
+                                  f'Pitch Track - {selected_string}', duration,
+                                  (tolerance_low, tolerance_high), limit, sustained),
+                use_container_width=True
+            )
+        else:
+            figure_key = ('pitch_track', track_source, detector_method, target_freq,
+                          selected_string, string_color)
+            png = FIGURE_CACHE.get(figure_key)
+            if png is None:
+                fig, ax = create_light_figure(figsize=(12, 5))
+                
+                ax.axhspan(tolerance_low, tolerance_high, alpha=0.12, color='#00d084', label='In Tune')
+                ax.axhline(0, color='#00d084', linestyle='--', linewidth=1.5, alpha=0.8)
+                
+                if sustained:
+                    ax.axvspan(sustained.start, sustained.end, alpha=0.08, color='#667eea',
+                              label='Sustained Segment')
+                
+                ax.plot(track.times[voiced], track.cents[voiced], color=string_color,
+                       linewidth=1.5, marker='o', markersize=3, alpha=0.9, label='Pitch')
+                
+                ax.set_ylim([-limit, limit])
+                ax.set_xlim([0, duration])
+                
+                ax.set_title(f'Pitch Track - {selected_string}', color='#667eea',
+                            fontsize=14, fontweight='bold', pad=15)
+                ax.set_xlabel('Time (s)', color='#4a4a4a', fontsize=11)
+                ax.set_ylabel('Deviation (cents)', color='#4a4a4a', fontsize=11)
+                ax.legend(loc='upper right', framealpha=0.9)
+                ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                
+                png = FIGURE_CACHE.put(figure_key, fig)
+            show_figure(png)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        if sustained:
+            col1.metric("🎵 Sustained Pitch", f"{sustained.frequency:.2f} Hz")
+            col2.metric("📊 Cents", f"{calculate_cents(sustained.frequency, target_freq):+.1f}")
+            col3.metric("⏱️ Segment", f"{sustained.start:.2f}-{sustained.end:.2f}s")
+        else:
+            col1.metric("🎵 Sustained Pitch", "--")
+            col2.metric("📊 Cents", "--")
+            col3.metric("⏱️ Segment", "--")
+        col4.metric("🔊 Voiced Frames", f"{100 * voiced.mean():.0f}%")
+    
+    # VIEW 8: Strobe
+    if view == views[7]:
+        st.markdown("#### 🌀 Strobe Tuner")
+        
+        # Start where the note settles: the pluck attack has no steady phase
+        strobe_source, strobe_audio, strobe_rate, track = get_current_pitch_track(detector_method)
+        sustained = sustained_pitch(track)
+        strobe_start = sustained.start if sustained else 0.0
+        strobe = get_strobe_track(strobe_source, strobe_audio, strobe_rate, target_freq, strobe_start)
+        
+        if strobe is None:
+            st.warning(f"⚠️ No partial found within a semitone of {target_freq} Hz")
+        else:
+            detune = strobe.frequency - target_freq
+            st.markdown(render_strobe(detune, strobe.phase[-1], string_color),
+                        unsafe_allow_html=True)
+            
+            if interactive_plots:
+                st.vega_lite_chart(
+                    strobe_phase_chart(strobe_start + strobe.times, strobe.phase, string_color,
+                                       f'Strobe Phase - {selected_string}'),
+                    use_container_width=True
+                )
+            else:
+                figure_key = ('strobe', strobe_source, target_freq, strobe_start, selected_string,
+                              string_color)
+                png = FIGURE_CACHE.get(figure_key)
+                if png is None:
+                    fig, ax = create_light_figure(figsize=(12, 4))
+                    
+                    ax.plot(strobe_start + strobe.times, strobe.phase, color=string_color,
+                           linewidth=2, alpha=0.9)
+                    
+                    ax.set_title(f'Strobe Phase - {selected_string}', color='#667eea',
+                                fontsize=14, fontweight='bold', pad=15)
+                    ax.set_xlabel('Time (s)', color='#4a4a4a', fontsize=11)
+                    ax.set_ylabel('Strobe phase (cycles)', color='#4a4a4a', fontsize=11)
+                    ax.grid(True, alpha=0.3, color='#c0c0c0', linestyle='--')
+                    
+                    png = FIGURE_CACHE.put(figure_key, fig)
+                show_figure(png)
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("🌀 Phase Vocoder", f"{strobe.frequency:.3f} Hz")
+            col2.metric("📊 Cents", f"{calculate_cents(strobe.frequency, target_freq):+.2f}")
+            col3.metric("🎯 Precision", f"±{strobe.error:.3f} Hz")
+            col4.metric("⏱️ Audio Used", f"{1000 * (strobe.times[-1] + VOCODER_FRAME_SECONDS):.0f} ms")
+            st.caption("The rings turn at the measured detune: clockwise when sharp, "
+                       "anticlockwise when flat, still when in tune. "
+                       "Each ring inward follows the next octave and drifts twice as fast.")
+    
+    # Performance
+    if perf_timer is not None:
+        perf_timer.stop('plotting')
+        if not st.session_state.perf_logged:
+            perf_timer.log(
+                file=st.session_state.current_filename,
+                sample_rate=st.session_state.sample_rate,
+                samples=len(st.session_state.audio_data),
+                method=detector_method,
+                zoom=zoom_refine,
+                decimate=decimate,
+                adaptive_hum=adaptive_hum,
+                target_band=target_band,
+                segment=segment
+            )
+            st.session_state.perf_logged = True
+        
+        with st.expander("⏱️ Performance"):
+            stage_names = list(perf_timer.stages)
+            stage_ms = np.array([perf_timer.stages[name] for name in stage_names])
+            
+            if interactive_plots:
+                st.vega_lite_chart(stage_chart(stage_names, stage_ms), use_container_width=True)
+            else:
+                fig, ax = create_light_figure(figsize=(10, 0.5 + 0.4 * len(stage_names)))
+                ax.barh(stage_names, stage_ms, color='#667eea', alpha=0.8)
+                ax.invert_yaxis()
+                ax.set_xlabel('Wall time (ms)', color='#4a4a4a', fontsize=11)
+                ax.grid(True, axis='x', alpha=0.3, color='#c0c0c0', linestyle='--')
+                st.pyplot(fig)
+                plt.close()
+            
+            st.dataframe(
+                {
+                    "Stage": stage_names,
+                    "Time (ms)": np.round(stage_ms, 2),
+                    "Share": [f"{100 * ms / perf_timer.total_ms:.1f}%" for ms in stage_ms]
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption(f"Total: {perf_timer.total_ms:.1f} ms · plotting is re-measured on every rerun")
+            st.caption(
+                f"Figure cache: {len(FIGURE_CACHE)} figures, {FIGURE_CACHE.nbytes / 2**20:.1f} MB, "
+                f"{FIGURE_CACHE.hits} hits / {FIGURE_CACHE.misses} misses"
+            )
+            disk_cache = get_disk_cache()
+            if disk_cache is not None:
+                st.caption(
+                    f"Disk cache: {len(disk_cache)} entries, {disk_cache.nbytes / 2**20:.1f} MB, "
+                    f"{disk_cache.hits} hits / {disk_cache.misses} misses"
+                )
 
 else:
     # ==================== WELCOME SCREEN ====================
@@ -898,9 +1501,10 @@ else:
         - 🎯 High-precision detection (±0.1 Hz)
         - 🔊 Advanced DSP filtering
         - 🎨 Color-coded visual feedback
-        - 📊 7 visualization modes
+        - 📊 8 visualization modes
         - 🎵 All 6 guitar strings
         - 📈 Real-time FFT analysis
+        - 🎙️ Live microphone tuning
         """)
     
     st.markdown("---")
@@ -973,3 +1577,28 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# ==================== LIVE LOOP ====================
+if live_mode:
+    live_source = None
+    try:
+        if live_source_name == "Microphone":
+            live_source = MicrophoneSource()
+        elif st.session_state.audio_data is not None:
+            live_source = FileSource(
+                st.session_state.audio_data,
+                sample_rate=st.session_state.sample_rate,
+                loop=True
+            )
+        else:
+            live_placeholder.warning("⚠️ Upload audio to simulate a live input")
+    except Exception as e:
+        live_placeholder.error(f"❌ Live input unavailable: {str(e)}")
+    
+    if live_source is not None:
+        live_tuner = StreamingTuner(
+            live_source.sample_rate, None if auto_string else target_freq,
+            zoom=zoom_refine, method=detector_method, tuning=tuning, adaptive_hum=adaptive_hum,
+            target_band=target_band
+        )
+        run_live_tuner(live_source, live_tuner, live_placeholder)
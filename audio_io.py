@@ -0,0 +1,80 @@
+"""
+🎸 Guitar Tuner Pro - Audio Loading
+Chunked decoding that only reads the frames the analysis needs
+"""
+
+import hashlib
+import io
+import warnings
+
+import numpy as np
+import soundfile as sf
+import librosa
+
+# ==================== SETTINGS ====================
+MAX_DURATION = 5.0          # seconds analysed per recording
+DECODE_BLOCK_SIZE = 65536   # frames per decoded chunk
+
+# ==================== FUNCTIONS ====================
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def iter_audio_blocks(source, max_seconds=MAX_DURATION, blocksize=DECODE_BLOCK_SIZE):
+    """Yield (mono_block, sample_rate) chunks of a path or file-like object
+
+    Decoding stops after max_seconds (None = whole file), so memory and time
+    do not grow with the length of the recording. Formats libsndfile cannot
+    open fall back to librosa, limited to the same duration.
+    """
+    _rewind(source)
+    try:
+        sound_file = sf.SoundFile(source)
+    except (sf.SoundFileError, RuntimeError, TypeError):
+        sound_file = None
+
+    if sound_file is not None:
+        with sound_file:
+            sample_rate = sound_file.samplerate
+            remaining = sound_file.frames if sound_file.seekable() else -1
+            if max_seconds is not None:
+                limit = int(max_seconds * sample_rate)
+                remaining = limit if remaining < 0 else min(remaining, limit)
+
+            while remaining != 0:
+                frames = blocksize if remaining < 0 else min(blocksize, remaining)
+                block = sound_file.read(frames=frames, dtype='float32', always_2d=True)
+                if len(block) == 0:
+                    break
+                if remaining > 0:
+                    remaining -= len(block)
+                yield block.mean(axis=1), sample_rate
+        return
+
+    _rewind(source)
+    with warnings.catch_warnings():
+        # soundfile was already tried above, librosa's own retry warning is noise
+        warnings.simplefilter('ignore')
+        audio_data, sample_rate = librosa.load(source, sr=None, mono=True, duration=max_seconds)
+    for start in range(0, len(audio_data), blocksize):
+        yield audio_data[start:start + blocksize], sample_rate
+
+def upload_fingerprint(data):
+    """Content hash of encoded audio bytes, so an unchanged upload is not decoded twice"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def load_audio_bytes(data, max_seconds=MAX_DURATION):
+    """load_audio() for an in-memory encoded file"""
+    return load_audio(io.BytesIO(data), max_seconds=max_seconds)
+
+def load_audio(source, max_seconds=MAX_DURATION, blocksize=DECODE_BLOCK_SIZE):
+    """Decode at most max_seconds of mono audio, return (audio_data, sample_rate)"""
+    blocks = []
+    sample_rate = None
+    for block, sample_rate in iter_audio_blocks(source, max_seconds, blocksize):
+        blocks.append(block)
+
+    if sample_rate is None:
+        raise ValueError("No audio frames could be decoded")
+    return np.concatenate(blocks).astype(np.float32, copy=False), sample_rate
@@ -0,0 +1,271 @@
+"""
+🎸 Guitar Tuner Pro - Batch Analysis
+Headless tuning analysis for directories of recordings
+
+Usage:
+    python batch.py recordings/ --string "A2 (5th)" -o results.csv
+    python batch.py "qa/**/*.flac" --target 110 --format jsonl --workers 8
+    python batch.py recordings/ --auto --tuning "Drop D"
+    python batch.py session.wav --auto --notes --max-seconds 120
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from audio_io import MAX_DURATION, load_audio
+from dsp import (
+    STRING_FREQUENCIES, TUNINGS, DETECTORS, DEFAULT_DETECTOR,
+    process_audio, process_notes, get_tuning_status, calculate_cents, identify_string
+)
+
+# ==================== SETTINGS ====================
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a')
+
+RESULT_FIELDS = [
+    'file', 'sample_rate', 'duration', 'string', 'target_freq', 'detected_freq',
+    'diff_hz', 'cents', 'status', 'decode_ms', 'analysis_ms', 'error'
+]
+
+# --notes: one row per note, located by its onset and analysed sustain
+NOTE_FIELDS = (RESULT_FIELDS[:3] + ['note', 'onset', 'sustain_start', 'sustain_end']
+               + RESULT_FIELDS[3:])
+
+# ==================== FUNCTIONS ====================
+
+def find_recordings(pattern):
+    """List audio files in a directory (recursively) or matching a glob pattern"""
+    path = Path(pattern)
+    if path.is_dir():
+        files = (p for p in path.rglob('*') if p.suffix.lower() in AUDIO_EXTENSIONS)
+    else:
+        files = (Path(p) for p in glob.glob(pattern, recursive=True))
+    return sorted(str(p) for p in files if p.is_file())
+
+def fill_tuning(row, detected_freq, target_freq, tuning):
+    """Add the string, deviation and status of a detected frequency to a result row"""
+    if target_freq is None:
+        row['string'], target_freq, _ = identify_string(detected_freq, tuning)
+        row['target_freq'] = target_freq
+
+    status_text = get_tuning_status(detected_freq, target_freq)[0]
+    row.update(
+        detected_freq=round(detected_freq, 4),
+        diff_hz=round(detected_freq - target_freq, 4),
+        cents=round(float(calculate_cents(detected_freq, target_freq)), 3),
+        status=status_text.rsplit(' ', 1)[0]
+    )
+
+def analyze_file(path, target_freq=None, tuning=STRING_FREQUENCIES,
+                 method=DEFAULT_DETECTOR, zoom=False, max_seconds=MAX_DURATION, decimate=False,
+                 adaptive_hum=False, segment=False, string=None):
+    """Decode and analyse one recording, return a result row
+
+    With target_freq=None the nearest string of tuning is used as the target,
+    otherwise string names the string target_freq belongs to.
+    segment=True only analyses the sustain of the longest note.
+    """
+    row = dict.fromkeys(RESULT_FIELDS)
+    row.update(file=str(path), string=string, target_freq=target_freq)
+
+    try:
+        start = time.perf_counter()
+        audio_data, sample_rate = load_audio(path, max_seconds=max_seconds)
+        decoded = time.perf_counter()
+
+        _, detected_freq, status = process_audio(
+            audio_data, sample_rate, target_freq, zoom=zoom, method=method, decimate=decimate,
+            adaptive_hum=adaptive_hum, segment=segment, tuning=tuning
+        )
+        analysed = time.perf_counter()
+
+        row.update(
+            sample_rate=sample_rate,
+            duration=round(len(audio_data) / sample_rate, 4),
+            decode_ms=round((decoded - start) * 1000, 3),
+            analysis_ms=round((analysed - decoded) * 1000, 3)
+        )
+        if status != "Success":
+            row['error'] = status
+            return row
+
+        fill_tuning(row, detected_freq, target_freq, tuning)
+
+    except Exception as e:
+        row['error'] = str(e) or type(e).__name__
+
+    return row
+
+def analyze_notes(path, target_freq=None, tuning=STRING_FREQUENCIES,
+                  method=DEFAULT_DETECTOR, zoom=False, max_seconds=MAX_DURATION, decimate=False,
+                  adaptive_hum=False, string=None):
+    """Decode one recording and analyse every note in it, return one row per note
+
+    analysis_ms is the whole file's filtering, segmentation and detection.
+    A file without notes (or that fails) gives a single row with an error.
+    Targets and string are those of analyze_file().
+    """
+    base = dict.fromkeys(NOTE_FIELDS)
+    base.update(file=str(path), string=string, target_freq=target_freq)
+
+    try:
+        start = time.perf_counter()
+        audio_data, sample_rate = load_audio(path, max_seconds=max_seconds)
+        decoded = time.perf_counter()
+
+        readings = process_notes(audio_data, sample_rate, target_freq, zoom=zoom, method=method,
+                                 decimate=decimate, adaptive_hum=adaptive_hum,
+                                 tuning=tuning)
+        analysed = time.perf_counter()
+
+        base.update(
+            sample_rate=sample_rate,
+            duration=round(len(audio_data) / sample_rate, 4),
+            decode_ms=round((decoded - start) * 1000, 3),
+            analysis_ms=round((analysed - decoded) * 1000, 3)
+        )
+        if not readings:
+            return [dict(base, error="No note found above the silence threshold")]
+
+        rows = []
+        for i, (note, detected_freq, _) in enumerate(readings, 1):
+            row = dict(base, note=i, onset=round(note.onset, 3),
+                       sustain_start=round(note.start, 3), sustain_end=round(note.end, 3))
+            if detected_freq is None:
+                row['error'] = "No frequency detected in guitar range"
+            else:
+                fill_tuning(row, detected_freq, target_freq, tuning)
+            rows.append(row)
+        return rows
+
+    except Exception as e:
+        return [dict(base, error=str(e) or type(e).__name__)]
+
+def analyze_files(paths, target_freq, workers=None, notes=False, **options):
+    """Analyse many recordings in a process pool, yielding rows in input order
+
+    With notes=True every file yields one row per note (see analyze_notes).
+    """
+    worker = partial(analyze_notes if notes else analyze_file, target_freq=target_freq, **options)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) <= 1:
+        results = map(worker, paths)
+        yield from (row for rows in results for row in rows) if notes else results
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(paths) // (4 * workers))
+        results = executor.map(worker, paths, chunksize=chunksize)
+        yield from (row for rows in results for row in rows) if notes else results
+
+def write_results(rows, output, fmt='csv', fields=RESULT_FIELDS):
+    """Stream result rows to an open text file as CSV or JSON lines"""
+    if fmt == 'csv':
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+    for row in rows:
+        if fmt == 'csv':
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(row) + '\n')
+        output.flush()
+
+# ==================== CLI ====================
+
+def positive_float(text):
+    """argparse type for a finite frequency above zero"""
+    value = float(text)
+    if not 0 < value < float('inf'):
+        raise argparse.ArgumentTypeError(f"must be a positive frequency, got {text}")
+    return value
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Batch tuning analysis of recorded guitar strings"
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="Directories or glob patterns of recordings")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--string', choices=list(STRING_FREQUENCIES.keys()),
+                        help="Target string name")
+    target.add_argument('--target', type=positive_float, help="Target frequency in Hz")
+    target.add_argument('--auto', action='store_true',
+                        help="Match every file to the nearest string of --tuning")
+    parser.add_argument('--tuning', choices=list(TUNINGS.keys()), default='Standard',
+                        help="Tuning used by --auto (default: %(default)s)")
+    parser.add_argument('--method', choices=list(DETECTORS.keys()),
+                        default=DEFAULT_DETECTOR, help="Pitch detector")
+    parser.add_argument('--zoom', action='store_true',
+                        help="Chirp-z zoom peak refinement")
+    parser.add_argument('--decimate', action='store_true',
+                        help="Decimate to ~4 kHz before filtering and FFT")
+    parser.add_argument('--adaptive-hum', action='store_true',
+                        help="Track 50/60 Hz mains hum and notch its harmonics too")
+    analysis = parser.add_mutually_exclusive_group()
+    analysis.add_argument('--segment', action='store_true',
+                          help="Only analyse the sustain of the longest note, "
+                               "skipping silence and the pluck attack")
+    analysis.add_argument('--notes', action='store_true',
+                          help="Split each recording at note onsets and write one row per note")
+    parser.add_argument('--max-seconds', type=float, default=MAX_DURATION,
+                        help="Audio analysed per file (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                        help="Output format (default: from --output suffix, else csv)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Output file (default: stdout)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    paths = []
+    for pattern in args.inputs:
+        paths.extend(find_recordings(pattern))
+    if not paths:
+        print("No recordings found", file=sys.stderr)
+        return 1
+
+    tuning = TUNINGS[args.tuning]
+    if args.auto:
+        string, target_freq = None, None
+    elif args.target is not None:
+        # A bare frequency is reported against the nearest string of the tuning
+        string, target_freq = identify_string(args.target, tuning)[0], args.target
+    else:
+        string, target_freq = args.string, STRING_FREQUENCIES[args.string]
+    fmt = args.format or ('jsonl' if args.output.endswith('.jsonl') else 'csv')
+
+    # Note rows always analyse sustains only
+    options = {} if args.notes else {'segment': args.segment}
+    rows = analyze_files(
+        paths, target_freq, workers=args.workers, notes=args.notes, tuning=tuning, string=string,
+        method=args.method, zoom=args.zoom, max_seconds=args.max_seconds,
+        decimate=args.decimate, adaptive_hum=args.adaptive_hum, **options
+    )
+    fields = NOTE_FIELDS if args.notes else RESULT_FIELDS
+
+    start = time.perf_counter()
+    if args.output == '-':
+        write_results(rows, sys.stdout, fmt, fields)
+    else:
+        with open(args.output, 'w', newline='') as output:
+            write_results(rows, output, fmt, fields)
+    elapsed = time.perf_counter() - start
+
+    print(f"Analysed {len(paths)} files in {elapsed:.2f}s "
+          f"({len(paths) / elapsed:.1f} files/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+🎸 Guitar Tuner Pro - Benchmarks
+Speed and accuracy of the DSP pipeline on synthetic plucked strings
+
+Usage:
+    python benchmark.py -o bench.json
+    python benchmark.py --method yin --decimate -o bench-yin.json
+    python benchmark.py --adaptive-hum --compare bench.json
+    python benchmark.py --quick --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import scipy
+
+from dsp import STRING_FREQUENCIES, DETECTORS, DEFAULT_DETECTOR, process_audio, calculate_cents
+from profiling import StageTimer
+
+# ==================== SETTINGS ====================
+BENCH_DURATIONS = (1.0, 3.0, 5.0)
+BENCH_SAMPLE_RATES = (22050, 44100, 48000)
+BENCH_HUM_FREQS = (50, 60)
+BENCH_REPEATS = 5
+BENCH_SEED = 1234
+
+PLUCK_HARMONICS = 8
+PLUCK_INHARMONICITY = 1e-4      # stiff-string B: partial k sits at k·f0·sqrt(1 + B·k²)
+PLUCK_DECAY = 1.5               # seconds for the fundamental to fall by 1/e
+PLUCK_HUM_LEVEL = 0.2
+PLUCK_NOISE_LEVEL = 0.01
+
+REGRESSION_SPEED = 0.25         # flag stages more than 25% slower (summed over all cases)
+REGRESSION_CENTS = 0.1          # flag cases whose error grew by more than 0.1 cent
+
+# ==================== SIGNALS ====================
+
+def synth_pluck(freq, sample_rate, duration, harmonics=PLUCK_HARMONICS,
+                inharmonicity=PLUCK_INHARMONICITY, hum_freq=50, hum_level=PLUCK_HUM_LEVEL,
+                noise_level=PLUCK_NOISE_LEVEL, decay=PLUCK_DECAY, seed=BENCH_SEED):
+    """Synthetic plucked string with stretched partials, mains hum and white noise
+
+    Returns (audio_data, true_freq) where true_freq is the first partial,
+    which inharmonicity places slightly above freq.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+
+    k = np.arange(1, harmonics + 1)
+    partials = k * freq * np.sqrt(1 + inharmonicity * k ** 2)
+    partials = partials[partials < 0.45 * sample_rate]
+    k = k[:len(partials)]
+    # Higher partials start weaker and die faster
+    amplitudes = (1 / k)[:, None] * np.exp(-t[None, :] * k[:, None] / (decay * np.sqrt(k[:, None])))
+    phases = rng.uniform(0, 2 * np.pi, len(partials))
+    audio = (amplitudes * np.sin(2 * np.pi * partials[:, None] * t + phases[:, None])).sum(axis=0)
+
+    if hum_level:
+        audio += hum_level * (np.sin(2 * np.pi * hum_freq * t)
+                              + 0.3 * np.sin(2 * np.pi * 3 * hum_freq * t))
+    audio += noise_level * rng.standard_normal(len(t))
+    audio /= np.max(np.abs(audio))
+    return audio.astype(np.float32), float(partials[0])
+
+# ==================== BENCHMARK ====================
+
+def run_case(audio_data, sample_rate, target_freq, true_freq, repeats=BENCH_REPEATS, **options):
+    """Time process_audio on one signal, return median stage times and the pitch error"""
+    stage_runs = defaultdict(list)
+    total_runs = []
+    detected_freq = None
+
+    for _ in range(repeats):
+        timer = StageTimer()
+        start = time.perf_counter()
+        _, detected_freq, status = process_audio(audio_data, sample_rate, target_freq,
+                                                 timer=timer, **options)
+        total_runs.append((time.perf_counter() - start) * 1000)
+        for name, ms in timer.stages.items():
+            stage_runs[name].append(ms)
+
+    duration = len(audio_data) / sample_rate
+    total_ms = float(np.median(total_runs))
+    error = None if detected_freq is None else float(calculate_cents(detected_freq, true_freq))
+    return {
+        'detected_freq': detected_freq,
+        'cents_error': error,
+        'status': status,
+        'total_ms': round(total_ms, 4),
+        'stages_ms': {name: round(float(np.median(ms)), 4) for name, ms in stage_runs.items()},
+        'realtime_factor': round(duration / (total_ms / 1000), 2)
+    }
+
+def run_suite(durations=BENCH_DURATIONS, sample_rates=BENCH_SAMPLE_RATES,
+              hum_freqs=BENCH_HUM_FREQS, strings=STRING_FREQUENCIES,
+              repeats=BENCH_REPEATS, **options):
+    """Benchmark every string × duration × sample rate × hum frequency, yielding case records"""
+    for sample_rate in sample_rates:
+        for duration in durations:
+            for hum_freq in hum_freqs:
+                for i, (name, freq) in enumerate(strings.items()):
+                    audio_data, true_freq = synth_pluck(freq, sample_rate, duration,
+                                                        hum_freq=hum_freq, seed=BENCH_SEED + i)
+                    case = {'string': name, 'target_freq': freq, 'true_freq': round(true_freq, 6),
+                            'sample_rate': sample_rate, 'duration': duration, 'hum_freq': hum_freq}
+                    case.update(run_case(audio_data, sample_rate, freq, true_freq, repeats, **options))
+                    yield case
+
+def summarize(cases):
+    """Accuracy and speed per (sample_rate, duration)"""
+    groups = defaultdict(list)
+    for case in cases:
+        groups[(case['sample_rate'], case['duration'])].append(case)
+
+    summary = []
+    for (sample_rate, duration), group in sorted(groups.items()):
+        errors = np.array([abs(c['cents_error']) if c['cents_error'] is not None else np.inf
+                           for c in group])
+        summary.append({
+            'sample_rate': sample_rate,
+            'duration': duration,
+            'cases': len(group),
+            'failures': int(np.sum(~np.isfinite(errors) | (errors > 50))),
+            'median_abs_cents': round(float(np.median(errors)), 4),
+            'max_abs_cents': round(float(np.max(errors)), 4),
+            'median_ms': round(float(np.median([c['total_ms'] for c in group])), 4),
+            'median_realtime_factor': round(float(np.median([c['realtime_factor'] for c in group])), 1)
+        })
+    return summary
+
+def environment():
+    """Versions and machine the results were measured on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine()
+    }
+
+def case_key(case):
+    return (case['string'], case['sample_rate'], case['duration'], case['hum_freq'])
+
+def compare(baseline, current, speed=REGRESSION_SPEED, cents=REGRESSION_CENTS):
+    """List human-readable regressions of current against a baseline result file
+
+    Accuracy is checked case by case; speed per stage, summed over the cases
+    both runs share, so single-case timer noise does not raise false alarms.
+    """
+    previous = {case_key(case): case for case in baseline['cases']}
+    regressions = []
+    old_stage_ms, new_stage_ms = defaultdict(float), defaultdict(float)
+    matched = 0
+
+    for case in current['cases']:
+        old = previous.get(case_key(case))
+        if old is None:
+            continue
+        matched += 1
+        label = f"{case['string']} @ {case['sample_rate']} Hz, {case['duration']}s, {case['hum_freq']} Hz hum"
+
+        if old['cents_error'] is not None and case['cents_error'] is None:
+            regressions.append(f"{label}: no longer detected")
+        elif old['cents_error'] is not None and \
+                abs(case['cents_error']) > abs(old['cents_error']) + cents:
+            regressions.append(f"{label}: error {old['cents_error']:+.3f} -> "
+                               f"{case['cents_error']:+.3f} cents")
+
+        for name, ms in case['stages_ms'].items():
+            if name in old['stages_ms']:
+                old_stage_ms[name] += old['stages_ms'][name]
+                new_stage_ms[name] += ms
+
+    for name, old_ms in old_stage_ms.items():
+        # Stages that only take microseconds are dominated by timer noise
+        if old_ms >= 1.0 and new_stage_ms[name] > old_ms * (1 + speed):
+            regressions.append(f"{name}: {old_ms:.2f} -> {new_stage_ms[name]:.2f} ms "
+                               f"over {matched} cases")
+    return regressions
+
+# ==================== CLI ====================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tuning pipeline on synthetic plucked strings"
+    )
+    parser.add_argument('--method', choices=list(DETECTORS.keys()), default=DEFAULT_DETECTOR,
+                        help="Pitch detector")
+    parser.add_argument('--zoom', action='store_true', help="Chirp-z zoom peak refinement")
+    parser.add_argument('--decimate', action='store_true',
+                        help="Decimate to ~4 kHz before filtering and FFT")
+    parser.add_argument('--adaptive-hum', action='store_true',
+                        help="Track 50/60 Hz mains hum and notch its harmonics too")
+    parser.add_argument('--target-band', action='store_true',
+                        help="Search only around the target string with the band DFT")
+    parser.add_argument('--segment', action='store_true',
+                        help="Only analyse the sustain of the longest note")
+    parser.add_argument('--durations', type=float, nargs='+', default=list(BENCH_DURATIONS),
+                        help="Clip lengths in seconds (default: %(default)s)")
+    parser.add_argument('--sample-rates', type=int, nargs='+', default=list(BENCH_SAMPLE_RATES),
+                        help="Sample rates in Hz (default: %(default)s)")
+    parser.add_argument('--repeats', type=int, default=BENCH_REPEATS,
+                        help="Timed runs per case, the median is reported (default: %(default)s)")
+    parser.add_argument('--quick', action='store_true',
+                        help="Only 3 s clips at 44.1 kHz with 3 repeats")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Earlier result file to check for speed or accuracy regressions")
+    parser.add_argument('-o', '--output', default=None, help="Write results to a JSON file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.quick:
+        args.durations, args.sample_rates, args.repeats = [3.0], [44100], 3
+
+    options = {'method': args.method, 'zoom': args.zoom, 'decimate': args.decimate,
+               'adaptive_hum': args.adaptive_hum, 'target_band': args.target_band,
+               'segment': args.segment}
+    cases = list(run_suite(args.durations, args.sample_rates, repeats=args.repeats, **options))
+    results = {
+        'environment': environment(),
+        'options': options,
+        'summary': summarize(cases),
+        'cases': cases
+    }
+
+    for row in results['summary']:
+        print(f"{row['sample_rate']:>6} Hz {row['duration']:>4}s  "
+              f"|cents| median {row['median_abs_cents']:.3f} max {row['max_abs_cents']:.3f}  "
+              f"{row['median_ms']:8.2f} ms  {row['median_realtime_factor']:>7}x realtime  "
+              f"{row['failures']} failed", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), results)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
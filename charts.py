@@ -0,0 +1,218 @@
+"""
+🎸 Guitar Tuner Pro - Interactive Charts
+Vega-Lite specs rendered in the browser (st.vega_lite_chart) instead of server-side matplotlib
+"""
+
+import numpy as np
+
+# ==================== SETTINGS ====================
+CHART_POINTS = 1500             # points shipped per curve, whatever the signal length
+CHART_HEIGHT = 360
+TEXT_COLOR = '#4a4a4a'
+GRID_COLOR = '#e6e6e6'
+
+# ==================== HELPERS ====================
+
+def peak_decimate(x, y, points=CHART_POINTS):
+    """Keep the largest y of each of `points` buckets so narrow peaks survive"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= points:
+        return x, y
+    edges = np.linspace(0, len(y), points + 1).astype(int)[:-1]
+    peak = edges + np.array([np.argmax(y[a:b]) for a, b in zip(edges, np.append(edges[1:], len(y)))])
+    return x[peak], y[peak]
+
+def _values(**columns):
+    """Column arrays to Vega-Lite row records (6 significant digits, NaN becomes null)"""
+    names = list(columns)
+    arrays = [np.asarray(columns[name], dtype=float) for name in names]
+    return [
+        {name: (float(f'{value:.6g}') if np.isfinite(value) else None)
+         for name, value in zip(names, row)}
+        for row in zip(*arrays)
+    ]
+
+def _legend_scale(entries):
+    """Shared colour scale so every layer lands in one legend"""
+    return {'domain': [label for label, _ in entries], 'range': [color for _, color in entries]}
+
+def _legend_color(scale):
+    return {'field': 'label', 'type': 'nominal', 'scale': scale, 'title': None}
+
+def _marker_layers(markers, scale, dash=(6, 4)):
+    """Vertical rules at (x, color, label)"""
+    return [{
+        'data': {'values': [{'x': float(x), 'label': label}]},
+        'mark': {'type': 'rule', 'strokeDash': list(dash), 'size': 2, 'opacity': 0.85},
+        'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'color': _legend_color(scale)}
+    } for x, _, label in markers]
+
+def _band_layers(bands, scale, orient='x'):
+    """Shaded spans at (lo, hi, color, label) along x or y"""
+    return [{
+        'data': {'values': [{'lo': float(lo), 'hi': float(hi), 'label': label}]},
+        'mark': {'type': 'rect', 'opacity': 0.12},
+        'encoding': {
+            orient: {'field': 'lo', 'type': 'quantitative'},
+            orient + '2': {'field': 'hi'},
+            'color': _legend_color(scale)
+        }
+    } for lo, hi, _, label in bands]
+
+def _chart(title, layers, title_color='#667eea'):
+    """Layered chart with drag-to-pan / wheel-to-zoom on the first layer"""
+    layers[0]['params'] = [{'name': 'zoom', 'select': 'interval', 'bind': 'scales'}]
+    return {
+        'title': {'text': title, 'color': title_color, 'fontSize': 15},
+        'height': CHART_HEIGHT,
+        'layer': layers,
+        'config': {
+            'axis': {'labelColor': TEXT_COLOR, 'titleColor': TEXT_COLOR, 'gridColor': GRID_COLOR},
+            'legend': {'orient': 'top-right', 'fillColor': 'white', 'padding': 6}
+        }
+    }
+
+def _axis(field, title, domain=None, **extra):
+    encoding = {'field': field, 'type': 'quantitative', 'title': title, **extra}
+    if domain is not None:
+        encoding['scale'] = {'domain': [float(domain[0]), float(domain[1])]}
+    return encoding
+
+# ==================== CHARTS ====================
+
+def waveform_chart(times, lower, upper, color, title):
+    """Min/max envelope of a clip"""
+    return _chart(title, [{
+        'data': {'values': _values(t=times, lo=lower, hi=upper)},
+        'mark': {'type': 'area', 'color': color, 'opacity': 0.5, 'line': {'color': color}},
+        'encoding': {
+            'x': _axis('t', 'Time (s)', (0, times[-1] if len(times) else 1)),
+            'y': _axis('lo', 'Amplitude'),
+            'y2': {'field': 'hi'}
+        }
+    }])
+
+def spectrum_chart(freqs, magnitude, color, title, x_max, markers=(), bands=()):
+    """Magnitude spectrum up to x_max Hz with optional marker lines and shaded bands"""
+    keep = freqs <= x_max
+    freqs, magnitude = peak_decimate(freqs[keep], magnitude[keep])
+    scale = _legend_scale([(label, c) for *_, c, label in bands] +
+                          [(label, c) for _, c, label in markers])
+
+    layers = [{
+        'data': {'values': _values(f=freqs, m=magnitude)},
+        'mark': {'type': 'area', 'color': color, 'opacity': 0.25,
+                 'line': {'color': color, 'strokeWidth': 1.2}, 'clip': True},
+        'encoding': {
+            'x': _axis('f', 'Frequency (Hz)', (0, x_max)),
+            'y': _axis('m', 'Magnitude')
+        }
+    }]
+    layers += _band_layers(bands, scale)
+    layers += _marker_layers(markers, scale)
+    return _chart(title, layers, color)
+
+def response_chart(freqs, curves, title, x_max, y_domain, markers=()):
+    """Filter gain curves, curves = [(gain_db, color, label)]"""
+    keep = freqs <= x_max
+    entries = [(label, color) for _, color, label in curves]
+    data = []
+    for gain, _, label in curves:
+        rows = _values(f=freqs[keep], gain=gain[keep])
+        data += [dict(row, label=label) for row in rows]
+
+    layers = [{
+        'data': {'values': data},
+        'mark': {'type': 'line', 'strokeWidth': 2.5, 'clip': True},
+        'encoding': {
+            'x': _axis('f', 'Frequency (Hz)', (0, x_max)),
+            'y': _axis('gain', 'Gain (dB)', y_domain),
+            'color': {'field': 'label', 'type': 'nominal', 'scale': _legend_scale(entries),
+                      'title': None}
+        }
+    }]
+    layers += [{
+        'mark': {'type': 'rule', 'strokeDash': [2, 3], 'size': 2, 'color': color, 'opacity': 0.6},
+        'encoding': {'x': {'datum': float(x), 'type': 'quantitative'}}
+    } for x, color, _ in markers]
+    return _chart(title, layers)
+
+def pitch_track_chart(times, cents, color, title, duration, tolerance, limit, sustained=None):
+    """Cents over time against the in-tune band and the sustained segment"""
+    bands = [(tolerance[0], tolerance[1], '#00d084', 'In Tune')]
+    scale_entries = [('In Tune', '#00d084'), ('Pitch', color)]
+    if sustained:
+        scale_entries.append(('Sustained Segment', '#667eea'))
+    scale = _legend_scale(scale_entries)
+
+    layers = [{
+        'data': {'values': _values(t=times, c=cents)},
+        'transform': [{'calculate': "'Pitch'", 'as': 'label'}],
+        'mark': {'type': 'line', 'point': {'size': 14}, 'strokeWidth': 1.5, 'clip': True},
+        'encoding': {
+            'x': _axis('t', 'Time (s)', (0, duration)),
+            'y': _axis('c', 'Deviation (cents)', (-limit, limit)),
+            'color': _legend_color(scale)
+        }
+    }]
+    layers += _band_layers(bands, scale, orient='y')
+    if sustained:
+        layers += _band_layers([(sustained.start, sustained.end, '#667eea', 'Sustained Segment')],
+                               scale)
+    return _chart(title, layers)
+
+def strobe_phase_chart(times, cycles, color, title):
+    """Strobe phase in cycles over time: flat when in tune, the slope is the detune in Hz"""
+    return _chart(title, [{
+        'data': {'values': _values(t=times, p=cycles)},
+        'mark': {'type': 'line', 'color': color, 'strokeWidth': 2, 'clip': True},
+        'encoding': {
+            'x': _axis('t', 'Time (s)'),
+            'y': _axis('p', 'Strobe phase (cycles)', scale={'zero': False})
+        }
+    }])
+
+def tuning_meter_chart(diff, max_diff, tolerance, color, status):
+    """Horizontal needle meter of the deviation in Hz"""
+    needle = float(np.clip(diff, -max_diff, max_diff))
+    zones = [(-max_diff, -tolerance, '#4facfe'), (-tolerance, tolerance, '#00d084'),
+             (tolerance, max_diff, '#ff6b6b')]
+    x_scale = {'domain': [-max_diff, max_diff]}
+
+    layers = [{
+        'data': {'values': [{'lo': lo, 'hi': hi, 'color': c} for lo, hi, c in zones]},
+        'mark': {'type': 'rect', 'opacity': 0.3},
+        'encoding': {
+            'x': {'field': 'lo', 'type': 'quantitative', 'scale': x_scale,
+                  'title': 'Frequency Deviation (Hz)'},
+            'x2': {'field': 'hi'},
+            'color': {'field': 'color', 'type': 'nominal', 'scale': None}
+        }
+    }, {
+        'mark': {'type': 'rule', 'size': 8, 'color': color, 'strokeCap': 'round'},
+        'encoding': {'x': {'datum': needle, 'type': 'quantitative', 'scale': x_scale}}
+    }, {
+        'mark': {'type': 'text', 'fontSize': 22, 'fontWeight': 'bold', 'color': color,
+                 'dy': -70},
+        'encoding': {'x': {'datum': 0, 'type': 'quantitative', 'scale': x_scale},
+                     'text': {'value': status}}
+    }]
+    chart = _chart('', layers)
+    chart['height'] = 200
+    chart['config']['axisY'] = {'disable': True}
+    # The meter is a gauge, not a plot: no zooming
+    del layers[0]['params']
+    return chart
+
+def stage_chart(names, milliseconds):
+    """Horizontal bars of per-stage wall time"""
+    return {
+        'height': {'step': 22},
+        'data': {'values': [{'stage': n, 'ms': float(ms)} for n, ms in zip(names, milliseconds)]},
+        'mark': {'type': 'bar', 'color': '#667eea', 'opacity': 0.8},
+        'encoding': {
+            'y': {'field': 'stage', 'type': 'nominal', 'sort': None, 'title': None},
+            'x': {'field': 'ms', 'type': 'quantitative', 'title': 'Wall time (ms)'},
+            'tooltip': [{'field': 'stage'}, {'field': 'ms', 'format': '.2f'}]
+        }
+    }
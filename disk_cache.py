@@ -0,0 +1,235 @@
+"""
+🎸 Guitar Tuner Pro - Disk Cache
+Decoded audio and analysis results kept across restarts (SQLite index + .npy blobs)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+import audio_io
+import dsp
+from profiling import timed
+
+# ==================== SETTINGS ====================
+DISK_CACHE_DIR = os.environ.get(
+    'GUITAR_TUNER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'guitar_tuner')
+)
+DISK_CACHE_BYTES = 512 * 2 ** 20    # blobs beyond this are evicted least recently used first
+DISK_CACHE_VERSION = 2              # bump when a code change alters cached results
+
+CacheEntry = namedtuple('CacheEntry', ['meta', 'arrays'])
+
+# ==================== VERSIONING ====================
+
+def _settings(module):
+    # Scalars and tuples only: registries like DETECTORS hold functions whose repr changes per run
+    return {name: getattr(module, name) for name in dir(module)
+            if name.isupper() and isinstance(getattr(module, name), (int, float, str, tuple))}
+
+def pipeline_version():
+    """Fingerprint of DISK_CACHE_VERSION and every dsp / audio_io setting
+
+    Changing a DSP parameter (notch Q, zero padding, detector thresholds, ...)
+    changes the version, and entries stored under another version are dropped.
+    """
+    settings = {'version': DISK_CACHE_VERSION, 'dsp': _settings(dsp), 'audio_io': _settings(audio_io)}
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True, default=repr).encode(),
+                           digest_size=8).hexdigest()
+
+def cache_key(*parts, **options):
+    """Stable key for a content hash plus the options that produced a result"""
+    return hashlib.blake2b(json.dumps([parts, options], sort_keys=True, default=repr).encode(),
+                           digest_size=16).hexdigest()
+
+# ==================== CACHE ====================
+
+class DiskCache:
+    """Persistent LRU store of numpy arrays plus JSON metadata
+
+    Each entry is a row in a SQLite index and one .npy file per array, read
+    back memory-mapped. Entries are evicted oldest-used first once the blobs
+    exceed max_bytes. Safe to share between the threads of the app process.
+    """
+
+    def __init__(self, directory=DISK_CACHE_DIR, max_bytes=DISK_CACHE_BYTES, version=None):
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / 'blobs'
+        self.max_bytes = max_bytes
+        self.version = version or pipeline_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, kind TEXT, version TEXT, meta TEXT, "
+                "files TEXT, nbytes INTEGER, last_used REAL)"
+            )
+            stale = db.execute("SELECT files FROM entries WHERE version != ?",
+                               (self.version,)).fetchall()
+            db.execute("DELETE FROM entries WHERE version != ?", (self.version,))
+        for (files,) in stale:
+            self._remove_files(files)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        db = sqlite3.connect(self.directory / 'index.sqlite', timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _remove_files(self, files):
+        for name in json.loads(files):
+            (self.blob_dir / name).unlink(missing_ok=True)
+
+    def get(self, kind, key):
+        """CacheEntry(meta, arrays) for a key, or None on a miss"""
+        entry_key = f'{kind}:{key}'
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT meta, files FROM entries WHERE key = ?",
+                             (entry_key,)).fetchone()
+            if row is not None:
+                db.execute("UPDATE entries SET last_used = ? WHERE key = ?",
+                           (time.time(), entry_key))
+        if row is None:
+            self.misses += 1
+            return None
+
+        meta, files = json.loads(row[0]), json.loads(row[1])
+        try:
+            arrays = {name.split('.')[-2]: np.load(self.blob_dir / name, mmap_mode='r')
+                      for name in files}
+        except (OSError, ValueError):
+            # A blob went missing or was truncated: forget the entry
+            self.delete(kind, key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CacheEntry(meta, arrays)
+
+    def put(self, kind, key, meta=None, **arrays):
+        """Store JSON-serialisable meta and named arrays under key
+
+        An entry larger than max_bytes on its own is not stored: eviction
+        would otherwise empty the whole cache to make room for it.
+        """
+        if sum(np.asarray(array).nbytes for array in arrays.values()) > self.max_bytes:
+            return
+        entry_key = f'{kind}:{key}'
+        stem = hashlib.blake2b(entry_key.encode(), digest_size=16).hexdigest()
+        files, nbytes = [], 0
+        for name, array in arrays.items():
+            file_name = f'{stem}.{name}.npy'
+            # Write then rename, so readers never map a half-written blob
+            temp_path = self.blob_dir / f'{file_name}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as blob:
+                np.save(blob, np.ascontiguousarray(array))
+            os.replace(temp_path, self.blob_dir / file_name)
+            files.append(file_name)
+            nbytes += (self.blob_dir / file_name).stat().st_size
+
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry_key, kind, self.version, json.dumps(meta or {}), json.dumps(files),
+                 nbytes, time.time())
+            )
+            self._evict(db)
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, files, nbytes in db.execute(
+                "SELECT key, files, nbytes FROM entries ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._remove_files(files)
+            total -= nbytes
+
+    def delete(self, kind, key):
+        entry_key = f'{kind}:{key}'
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT files FROM entries WHERE key = ?", (entry_key,)).fetchone()
+            db.execute("DELETE FROM entries WHERE key = ?", (entry_key,))
+        if row is not None:
+            self._remove_files(row[0])
+
+    def clear(self):
+        with self._lock, self._connect() as db:
+            rows = db.execute("SELECT files FROM entries").fetchall()
+            db.execute("DELETE FROM entries")
+        for (files,) in rows:
+            self._remove_files(files)
+
+    @property
+    def nbytes(self):
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+# ==================== PIPELINE ====================
+# Each helper takes cache=None to run uncached (e.g. no writable cache directory)
+
+def cached_load_audio(cache, upload_hash, data, max_seconds=audio_io.MAX_DURATION):
+    """audio_io.load_audio_bytes() through the cache, keyed by the upload's content hash"""
+    key = cache_key(upload_hash, max_seconds=max_seconds)
+    entry = cache.get('audio', key) if cache is not None else None
+    if entry is not None:
+        return entry.arrays['audio'], entry.meta['sample_rate']
+
+    audio_data, sample_rate = audio_io.load_audio_bytes(data, max_seconds=max_seconds)
+    if cache is not None:
+        cache.put('audio', key, {'sample_rate': sample_rate}, audio=audio_data)
+    return audio_data, sample_rate
+
+def cached_magnitude_spectrum(cache, content_hash, audio_data, sample_rate):
+    """dsp.magnitude_spectrum() through the cache"""
+    key = cache_key(content_hash, sample_rate=sample_rate)
+    entry = cache.get('spectrum', key) if cache is not None else None
+    if entry is not None:
+        return entry.arrays['freqs'], entry.arrays['magnitude']
+
+    freqs, magnitude = dsp.magnitude_spectrum(audio_data, sample_rate)
+    if cache is not None:
+        cache.put('spectrum', key, freqs=freqs, magnitude=magnitude)
+    return freqs, magnitude
+
+def cached_process_audio(cache, content_hash, audio_data, sample_rate, target_freq, timer=None,
+                         **options):
+    """dsp.process_audio() through the cache, keyed by content, rate, target and options
+
+    Only successful analyses are stored. The lookup is timed as 'cache lookup';
+    on a hit the DSP stages are skipped and not recorded.
+    """
+    key = cache_key(content_hash, sample_rate=sample_rate, target_freq=target_freq, **options)
+    with timed(timer, 'cache lookup'):
+        entry = cache.get('analysis', key) if cache is not None else None
+    if entry is not None:
+        return entry.arrays['filtered'], entry.meta['detected_freq'], entry.meta['status']
+
+    filtered_audio, detected_freq, status = dsp.process_audio(
+        audio_data, sample_rate, target_freq, timer=timer, **options
+    )
+    if cache is not None and detected_freq is not None:
+        cache.put('analysis', key, {'detected_freq': detected_freq, 'status': status},
+                  filtered=filtered_audio)
+    return filtered_audio, detected_freq, status
@@ -0,0 +1,1177 @@
+"""
+🎸 Guitar Tuner Pro - DSP Core
+Filtering, frequency detection and tuning helpers
+Shared by the Streamlit app and the live tuner (no Streamlit imports here)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import cached_property, lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from scipy.fft import rfft, irfft, rfftfreq, next_fast_len
+
+from profiling import timed
+
+# ==================== DATA ====================
+STRING_FREQUENCIES = {
+    'E2 (6th - Low E)': 82.41,
+    'A2 (5th)': 110.00,
+    'D3 (4th)': 146.83,
+    'G3 (3rd)': 196.00,
+    'B3 (2nd)': 246.94,
+    'E4 (1st - High E)': 329.63
+}
+
+TUNINGS = {
+    'Standard': STRING_FREQUENCIES,
+    'Drop D': {
+        'D2 (6th - Low D)': 73.42,
+        'A2 (5th)': 110.00,
+        'D3 (4th)': 146.83,
+        'G3 (3rd)': 196.00,
+        'B3 (2nd)': 246.94,
+        'E4 (1st - High E)': 329.63
+    },
+    'Half Step Down': {
+        'Eb2 (6th - Low Eb)': 77.78,
+        'Ab2 (5th)': 103.83,
+        'Db3 (4th)': 138.59,
+        'Gb3 (3rd)': 185.00,
+        'Bb3 (2nd)': 233.08,
+        'Eb4 (1st - High Eb)': 311.13
+    },
+    'Open G': {
+        'D2 (6th - Low D)': 73.42,
+        'G2 (5th)': 98.00,
+        'D3 (4th)': 146.83,
+        'G3 (3rd)': 196.00,
+        'B3 (2nd)': 246.94,
+        'D4 (1st - High D)': 293.66
+    },
+    'DADGAD': {
+        'D2 (6th - Low D)': 73.42,
+        'A2 (5th)': 110.00,
+        'D3 (4th)': 146.83,
+        'G3 (3rd)': 196.00,
+        'A3 (2nd)': 220.00,
+        'D4 (1st - High D)': 293.66
+    }
+}
+
+TUNE_TOLERANCE = 2.0
+
+# ==================== SETTINGS ====================
+NOTCH_FREQ = 50
+NOTCH_Q = 30
+LOWPASS_CUTOFF = 500
+LOWPASS_ORDER = 4
+GUITAR_RANGE = (70, 400)
+FILTER_CACHE_SIZE = 8
+RESPONSE_POINTS = 4000
+ZERO_PAD_FACTOR = 4
+MAX_PADDED_FFT = 2 ** 18
+ZOOM_POINTS = 64
+REFINE_SPAN = 0.06          # about ±1 semitone
+HPS_HARMONICS = 4
+YIN_THRESHOLD = 0.15
+CEPSTRUM_PEAK_RATIO = 0.6
+CEPSTRUM_FLOOR_DB = 60
+AUTOCORR_PEAK_RATIO = 0.9
+SUBHARMONIC_DB = 30         # an estimate this far below a multiple of itself is a subharmonic
+SUBHARMONIC_MULTIPLES = 3   # multiples of an estimate checked for the missing partial
+DEFAULT_DETECTOR = 'fft_peak'
+DECIMATE_RATE = 4000        # working rate of the decimated front end
+WAVEFORM_POINTS = 2000      # min/max buckets drawn for a waveform, whatever its length
+HUM_MAINS = (50, 60)        # nominal mains frequencies
+HUM_SEARCH_HZ = 1.0         # grid drift allowed around each nominal frequency
+HUM_HARMONICS = 4           # notches at f, 2f, ... N·f
+HUM_BANDWIDTH = 2.0         # -3 dB width of every hum notch in Hz
+HUM_GUARD_CENTS = 50        # no notch this close to the target string
+HUM_PRESENCE_DB = 12        # mains peak over the surrounding floor needed to call it hum
+HUM_MIN_SECONDS = 0.25      # audio needed for a first mains estimate
+HUM_ESTIMATE_SECONDS = 1.0  # audio per estimate, and re-estimate interval when streaming
+HUM_RETUNE_HZ = 0.05        # redesign the notches when the mains moves further than this
+TARGET_SPAN_CENTS = 100     # band searched either side of a known target string
+TARGET_HARMONICS = 2        # target partials summed by the band detector
+TARGET_OVERSAMPLE = 2       # band grid points per DFT resolution step
+TARGET_MIN_SHARE = 0.2      # share of the window's energy the band peak must hold
+TARGET_TWIDDLE_POINTS = 2 ** 20     # twiddle matrix entries per block (8 MB in complex64)
+VOCODER_SECONDS = 0.4       # audio the phase slope is fitted over
+VOCODER_FRAME_SECONDS = 0.1 # frame length: Hann main lobe of ±2 / frame_seconds Hz
+VOCODER_HOP_SECONDS = 0.005 # phase advance is unambiguous while |f - rough| < 1 / (2·hop)
+VOCODER_SPAN_CENTS = 100    # partial searched this far either side of the reference
+ONSET_FRAME_SECONDS = 0.04
+ONSET_HOP_SECONDS = 0.01
+ONSET_RATE = 8000           # onsets are found on every n-th sample down to about this rate
+ONSET_COMPRESSION = 100     # log(1 + C·|X|) so quiet plucks still produce flux
+ONSET_DELTA = 0.1           # flux peak above the median, as a share of the median-to-max range
+ONSET_MIN_GAP = 0.1         # seconds between two onsets
+ONSET_RISE_DB = 6           # level jump an onset must bring
+ONSET_RANGE_DB = 24         # notes peaking this far below the loudest are skipped
+ONSET_SILENCE_DB = 40       # frames this far below the loudest are silence
+ATTACK_SECONDS = 0.05       # skipped after the level peak of a pluck
+SUSTAIN_DECAY_DB = 20       # sustain ends once a note decays this far below its peak
+SUSTAIN_MIN_SECONDS = 0.1   # shorter sustains are not analysed
+
+# ==================== FILTERS ====================
+
+class FilterDesign:
+    """Coefficients, SOS cascade and frequency responses for one filter configuration"""
+
+    def __init__(self, sample_rate, notch_freq=NOTCH_FREQ, notch_q=NOTCH_Q,
+                 lowpass_cutoff=LOWPASS_CUTOFF, lowpass_order=LOWPASS_ORDER):
+        self.sample_rate = sample_rate
+        self.b_notch, self.a_notch = signal.iirnotch(notch_freq, notch_q, fs=sample_rate)
+        self.b_low, self.a_low = signal.butter(lowpass_order, lowpass_cutoff,
+                                               btype='low', fs=sample_rate)
+        sos_low = signal.butter(lowpass_order, lowpass_cutoff, btype='low',
+                                output='sos', fs=sample_rate)
+        self.sos = np.vstack([signal.tf2sos(self.b_notch, self.a_notch), sos_low])
+
+    @cached_property
+    def response(self):
+        """(freqs, notch_db, lowpass_db) sampled at RESPONSE_POINTS frequencies"""
+        freqs, h_notch = signal.freqz(self.b_notch, self.a_notch,
+                                      worN=RESPONSE_POINTS, fs=self.sample_rate)
+        _, h_low = signal.freqz(self.b_low, self.a_low,
+                                worN=RESPONSE_POINTS, fs=self.sample_rate)
+        return freqs, 20 * np.log10(np.abs(h_notch) + 1e-12), 20 * np.log10(np.abs(h_low) + 1e-12)
+
+
+class FilterBank:
+    """Bounded LRU store of filter designs keyed by (sample_rate, filter params)"""
+
+    def __init__(self, max_entries=FILTER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._designs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sample_rate, notch_freq=NOTCH_FREQ, notch_q=NOTCH_Q,
+            lowpass_cutoff=LOWPASS_CUTOFF, lowpass_order=LOWPASS_ORDER):
+        """Return the design for a configuration, designing it on first use"""
+        key = (float(sample_rate), notch_freq, notch_q, lowpass_cutoff, lowpass_order)
+        with self._lock:
+            if key in self._designs:
+                self._designs.move_to_end(key)
+                return self._designs[key]
+
+        design = FilterDesign(*key)
+        with self._lock:
+            design = self._designs.setdefault(key, design)
+            self._designs.move_to_end(key)
+            while len(self._designs) > self.max_entries:
+                self._designs.popitem(last=False)
+        return design
+
+    def __len__(self):
+        return len(self._designs)
+
+
+FILTER_BANK = FilterBank()
+
+def line_spectrum(audio_data, sample_rate):
+    """(freqs, power) of the first HUM_ESTIMATE_SECONDS with bins of at most 1 Hz, or None"""
+    audio = audio_data[:int(HUM_ESTIMATE_SECONDS * sample_rate)]
+    if len(audio) < 3:
+        return None
+    # At least 1 Hz bins; the parabolic fit on the log spectrum does the rest
+    frames = SpectralFrames(audio, sample_rate, zero_pad=int(np.ceil(sample_rate / len(audio))))
+    power = frames.magnitude[0] ** 2
+    return np.arange(len(power)) * frames.bin_hz, power
+
+def estimate_mains_frequency(audio_data, sample_rate, mains=HUM_MAINS, search=HUM_SEARCH_HZ,
+                             presence_db=HUM_PRESENCE_DB, spectrum=None):
+    """Mains hum frequency in a signal (e.g. 49.93 or 60.02 Hz), or None without audible hum
+
+    Looks for the strongest line within ±search Hz of each nominal mains
+    frequency in the first HUM_ESTIMATE_SECONDS. Only the fundamental is used:
+    guitar partials start at 70 Hz, but hum harmonics share the band with strings.
+    spectrum reuses a line_spectrum() of the same audio.
+    """
+    spectrum = spectrum or line_spectrum(audio_data, sample_rate)
+    if spectrum is None:
+        return None
+    freqs, power = spectrum
+
+    # Compare each candidate line against the 5 Hz either side of the search span
+    region = (freqs >= min(mains) - search - 5) & (freqs <= max(mains) + search + 5)
+    near_mains = np.any([np.abs(freqs - f) <= search for f in mains], axis=0)
+    floor = np.median(power[region & ~near_mains]) + 1e-30
+    idx = int(np.argmax(np.where(near_mains, power, 0)))
+    if power[idx] < floor * 10 ** (presence_db / 10):
+        return None
+
+    offset = parabolic_peak(np.log(power + 1e-30), idx)
+    return float((idx + offset) * freqs[1])
+
+def string_partial(spectrum, mains_freq, freq_range=GUITAR_RANGE):
+    """Strongest line in freq_range when it is louder than the mains line itself, else None
+
+    Hum harmonics are weaker than the mains fundamental, so a line that
+    outshines it is the string, even where it sits on k × mains (a slack A
+    string at 100 Hz, a D string at 150 Hz).
+    """
+    if spectrum is None or mains_freq is None:
+        return None
+    freqs, power = spectrum
+    band = np.flatnonzero((freqs >= freq_range[0]) & (freqs <= freq_range[1]))
+    if len(band) == 0:
+        return None
+    idx = band[int(np.argmax(power[band]))]
+    mains_idx = int(round(mains_freq / freqs[1]))
+    if power[idx] <= power[max(0, mains_idx - 1):mains_idx + 2].max():
+        return None
+    return float((idx + parabolic_peak(np.log(power + 1e-30), idx)) * freqs[1])
+
+def hum_guard(spectrum, mains_freq, target_freq=None, tuning=STRING_FREQUENCIES):
+    """Frequencies the hum notches must spare, as a sorted tuple rounded to 0.1 Hz
+
+    That is the target, or every string of the tuning when the target is
+    unknown, plus the loudest string partial (see string_partial), which
+    covers strings far out of tune too.
+    """
+    guard = {float(target_freq)} if target_freq else {float(f) for f in tuning.values()}
+    partial = string_partial(spectrum, mains_freq)
+    if partial is not None:
+        guard.add(partial)
+    return tuple(sorted(round(f, 1) for f in guard))
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def hum_notch_sos(sample_rate, mains_freq, harmonics=HUM_HARMONICS, bandwidth=HUM_BANDWIDTH,
+                  guard_freqs=()):
+    """SOS cascade of constant-bandwidth notches at the mains frequency and its harmonics
+
+    Q grows with the harmonic so every notch is `bandwidth` Hz wide. Harmonics
+    within HUM_GUARD_CENTS of any of guard_freqs (a tuple, see hum_guard) are
+    left alone: a D string tuned a little sharp sits right on 3 × 50 Hz and
+    would be notched away.
+    """
+    sections = []
+    for k in range(1, harmonics + 1):
+        freq = k * mains_freq
+        if freq >= 0.45 * sample_rate:
+            break
+        if any(abs(1200 * np.log2(freq / guard)) < HUM_GUARD_CENTS for guard in guard_freqs):
+            continue
+        b, a = signal.iirnotch(freq, freq / bandwidth, fs=sample_rate)
+        sections.append(signal.tf2sos(b, a))
+    return np.vstack(sections) if sections else np.zeros((0, 6))
+
+def hum_notch_response(sample_rate, mains_freq, guard_freqs=()):
+    """(freqs, gain_db) of the hum notch bank sampled at RESPONSE_POINTS frequencies"""
+    sos = hum_notch_sos(sample_rate, round(mains_freq, 2), guard_freqs=tuple(guard_freqs))
+    if len(sos) == 0:
+        sos = np.array([[1.0, 0, 0, 1.0, 0, 0]])
+    freqs, h = signal.sosfreqz(sos, worN=RESPONSE_POINTS, fs=sample_rate)
+    return freqs, 20 * np.log10(np.abs(h) + 1e-12)
+
+class HumCanceller:
+    """Notch bank that follows the measured mains frequency and its harmonics
+
+    The mains frequency is estimated from the signal itself, so 50 and 60 Hz
+    sites (and grid drift) are both covered. When streaming it is re-estimated
+    every HUM_ESTIMATE_SECONDS and the filter state is carried across chunks
+    and retunes. Audio without detectable hum passes through unchanged.
+    Notches spare target_freq, or without a target every string of tuning,
+    and the loudest string partial (see hum_guard).
+    """
+
+    def __init__(self, sample_rate, target_freq=None, tuning=STRING_FREQUENCIES,
+                 harmonics=HUM_HARMONICS, bandwidth=HUM_BANDWIDTH):
+        self.sample_rate = sample_rate
+        self.target_freq = target_freq
+        self.tuning = tuning
+        self.harmonics = harmonics
+        self.bandwidth = bandwidth
+        self.reset()
+
+    def reset(self):
+        """Forget the mains estimate and the streaming state"""
+        self.mains_freq = None
+        self.guard = ()
+        self.sos = None
+        self.zi = None
+        self._pending = []
+        self._pending_samples = 0
+
+    def retune(self, audio_data):
+        """Estimate the mains frequency from audio_data and move the notches if it changed"""
+        spectrum = line_spectrum(audio_data, self.sample_rate)
+        mains_freq = estimate_mains_frequency(audio_data, self.sample_rate, spectrum=spectrum)
+        if mains_freq is None:
+            # Keep the last tuning: hum masked by a loud pluck has not gone away
+            return self.mains_freq
+        guard = hum_guard(spectrum, mains_freq, self.target_freq, self.tuning)
+        if self.mains_freq is None or abs(mains_freq - self.mains_freq) > HUM_RETUNE_HZ \
+                or guard != self.guard:
+            self.mains_freq = mains_freq
+            self.guard = guard
+            sos = hum_notch_sos(self.sample_rate, round(mains_freq, 2), self.harmonics,
+                                self.bandwidth, guard)
+            if self.zi is not None and self.zi.shape[0] != len(sos):
+                self.zi = None
+            # Every harmonic may fall next to a spared string
+            self.sos = sos if len(sos) else None
+        return self.mains_freq
+
+    def filter_chunk(self, chunk):
+        """Causal hum removal of the next chunk of a stream"""
+        self._pending.append(chunk)
+        self._pending_samples += len(chunk)
+        needed = HUM_ESTIMATE_SECONDS if self.mains_freq is not None else HUM_MIN_SECONDS
+        if self._pending_samples >= needed * self.sample_rate:
+            recent = np.concatenate(self._pending)[-int(HUM_ESTIMATE_SECONDS * self.sample_rate):]
+            self._pending, self._pending_samples = [], 0
+            self.retune(recent)
+
+        if self.sos is None or len(chunk) == 0:
+            return chunk
+        if self.zi is None:
+            self.zi = signal.sosfilt_zi(self.sos) * chunk[0]
+        filtered, self.zi = signal.sosfilt(self.sos, chunk, zi=self.zi)
+        return filtered
+
+class FilterChain:
+    """Notch + lowpass chain designed once per sample rate
+
+    filter_offline() is zero-phase (forward-backward) for whole clips,
+    filter_chunk() is causal and carries the filter state between chunks.
+    With adaptive_hum=True a HumCanceller replaces the fixed notch; target_freq
+    keeps its notches off the string being tuned, or without a target every
+    string of tuning.
+    """
+
+    def __init__(self, sample_rate, adaptive_hum=False, target_freq=None,
+                 tuning=STRING_FREQUENCIES, **filter_params):
+        self.sample_rate = sample_rate
+        self.sos = FILTER_BANK.get(sample_rate, **filter_params).sos
+        self.hum = None
+        if adaptive_hum:
+            # The fixed notch is the first section of the cascade
+            self.sos = self.sos[1:]
+            self.hum = HumCanceller(sample_rate, target_freq, tuning)
+        self.zi = None
+
+    def reset(self):
+        """Forget the streaming state"""
+        self.zi = None
+        if self.hum is not None:
+            self.hum.reset()
+
+    def filter_offline(self, audio_data):
+        """Zero-phase filtering of a complete clip"""
+        sos = self.sos
+        if self.hum is not None:
+            self.hum.retune(audio_data)
+            if self.hum.sos is not None:
+                # One cascade, so the clip is only filtered forward and back once
+                sos = np.vstack([self.hum.sos, sos])
+        return signal.sosfiltfilt(sos, audio_data)
+
+    def filter_chunk(self, chunk):
+        """Causal filtering of the next chunk of a stream"""
+        if self.hum is not None:
+            chunk = self.hum.filter_chunk(chunk)
+        if len(chunk) == 0:
+            return np.zeros(0)
+        if self.zi is None:
+            # Start from the steady state of the first sample to avoid a step transient
+            self.zi = signal.sosfilt_zi(self.sos) * chunk[0]
+        filtered, self.zi = signal.sosfilt(self.sos, chunk, zi=self.zi)
+        return filtered
+
+def decimation_factor(sample_rate, target_rate=DECIMATE_RATE):
+    """Integer factor that brings sample_rate down to about target_rate (1 = none)"""
+    return max(1, int(sample_rate // target_rate))
+
+def decimate_audio(audio_data, sample_rate, target_rate=DECIMATE_RATE):
+    """Anti-aliased polyphase decimation, return (audio_data, working_rate)
+
+    Only 70-400 Hz (and the 500 Hz lowpass) matter for tuning, so a ~4 kHz
+    working rate keeps every partial the detectors use.
+    """
+    factor = decimation_factor(sample_rate, target_rate)
+    if factor == 1:
+        return audio_data, sample_rate
+    return signal.resample_poly(audio_data, 1, factor), sample_rate / factor
+
+# ==================== FRAMING ====================
+
+def parabolic_peak(values, idx):
+    """Vertex offset (in bins, -0.5..0.5) of the parabola through values[idx-1:idx+2]"""
+    if idx <= 0 or idx >= len(values) - 1:
+        return 0.0
+    a, b, c = values[idx - 1], values[idx], values[idx + 1]
+    denom = a - 2 * b + c
+    if denom == 0:
+        return 0.0
+    return float(np.clip(0.5 * (a - c) / denom, -0.5, 0.5))
+
+def parabolic_peaks(values, idx):
+    """Row-wise parabolic_peak for a 2-D array and one index per row"""
+    rows = np.arange(values.shape[0])
+    idx = np.clip(idx, 1, values.shape[1] - 2)
+    a, b, c = values[rows, idx - 1], values[rows, idx], values[rows, idx + 1]
+    denom = a - 2 * b + c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offsets = np.where(denom != 0, 0.5 * (a - c) / denom, 0.0)
+    return idx + np.clip(np.nan_to_num(offsets), -0.5, 0.5)
+
+
+class SpectralFrames:
+    """Framed view of a clip with lazily computed transforms shared by every detector
+
+    Frames are a zero-copy strided view. With frame_size=None the whole clip is
+    a single frame, which matches the classic one-FFT analysis.
+    """
+
+    def __init__(self, audio_data, sample_rate, frame_size=None, hop_size=None,
+                 zero_pad=ZERO_PAD_FACTOR):
+        audio = np.ascontiguousarray(audio_data, dtype=np.float64)
+        if frame_size is None or frame_size > len(audio):
+            frame_size = len(audio)
+        frame_size = int(frame_size)
+        hop_size = frame_size if hop_size is None else max(1, int(hop_size))
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.frames = sliding_window_view(audio, frame_size)[::hop_size]
+        # Long frames already have fine bins, so padding is capped
+        self.n_fft = next_fast_len(
+            max(frame_size, min(max(1, int(zero_pad)) * frame_size, MAX_PADDED_FFT))
+        )
+        self.bin_hz = sample_rate / self.n_fft
+
+    def __len__(self):
+        return self.frames.shape[0]
+
+    @property
+    def times(self):
+        """Centre time of every frame in seconds"""
+        return (np.arange(len(self)) * self.hop_size + self.frame_size / 2) / self.sample_rate
+
+    @cached_property
+    def level(self):
+        """RMS level of every frame"""
+        return np.sqrt(np.mean(self.frames ** 2, axis=1))
+
+    @cached_property
+    def windowed(self):
+        return self.frames * signal.get_window('hann', self.frame_size)
+
+    @cached_property
+    def magnitude(self):
+        return np.abs(rfft(self.windowed, self.n_fft, axis=-1))
+
+    @cached_property
+    def log_magnitude(self):
+        return np.log(self.magnitude + 1e-20)
+
+    @cached_property
+    def autocorrelation(self):
+        n = next_fast_len(2 * self.frame_size)
+        power = np.abs(rfft(self.frames, n, axis=-1)) ** 2
+        return irfft(power, n, axis=-1)[:, :self.frame_size]
+
+    @cached_property
+    def cepstrum(self):
+        # Floor the log spectrum so empty bands (above the lowpass or the
+        # decimation filter) do not dominate the low quefrencies
+        floor = self.magnitude.max(axis=1, keepdims=True) * 10 ** (-CEPSTRUM_FLOOR_DB / 20)
+        return irfft(np.log(self.magnitude + floor + 1e-20), self.n_fft, axis=-1)
+
+    def band_bins(self, freq_range):
+        """Inclusive spectrum bin range covering freq_range"""
+        lo = max(1, int(np.ceil(freq_range[0] / self.bin_hz)))
+        hi = min(self.magnitude.shape[1] - 2, int(np.floor(freq_range[1] / self.bin_hz)))
+        return lo, hi
+
+    def lag_range(self, freq_range):
+        """Inclusive lag / quefrency range (in samples) covering freq_range"""
+        lo = max(2, int(np.floor(self.sample_rate / freq_range[1])))
+        hi = min(self.frame_size - 2, int(np.ceil(self.sample_rate / freq_range[0])))
+        return lo, hi
+
+    def _local_peaks(self, frequencies):
+        """(valid, peak): set estimates and the strongest bin within ±REFINE_SPAN of each"""
+        frequencies = np.asarray(frequencies, dtype=float)
+        valid = np.isfinite(frequencies) & (frequencies > 0)
+        if not valid.any():
+            return valid, np.zeros(0, dtype=int)
+
+        centre = np.round(frequencies[valid] / self.bin_hz).astype(int)
+        width = max(2, int(np.ceil(REFINE_SPAN * np.nanmax(frequencies[valid]) / self.bin_hz)))
+        offsets = np.arange(-width, width + 1)
+        idx = np.clip(centre[:, None] + offsets, 1, self.magnitude.shape[1] - 2)
+
+        log_mag = self.log_magnitude[valid]
+        local = np.take_along_axis(log_mag, idx, axis=1)
+        # Each frame only searches its own ±span around the rough estimate
+        limit = np.ceil(REFINE_SPAN * frequencies[valid] / self.bin_hz)[:, None]
+        local = np.where(np.abs(offsets) <= np.maximum(limit, 2), local, -np.inf)
+
+        return valid, idx[np.arange(len(idx)), np.argmax(local, axis=1)]
+
+    def refine(self, frequencies):
+        """Snap rough per-frame estimates to the interpolated spectral peak within ±REFINE_SPAN"""
+        refined = np.full(len(self), np.nan)
+        valid, peak = self._local_peaks(frequencies)
+        refined[valid] = parabolic_peaks(self.log_magnitude[valid], peak) * self.bin_hz
+        return refined
+
+    def partial_level(self, frequencies):
+        """Log magnitude of the strongest bin within ±REFINE_SPAN of each estimate, -inf if unset"""
+        level = np.full(len(self), -np.inf)
+        valid, peak = self._local_peaks(frequencies)
+        level[valid] = self.log_magnitude[valid][np.arange(len(peak)), peak]
+        return level
+
+    def zoom_refine(self, frequencies):
+        """Chirp-z zoom over ±2 bins around each estimate"""
+        refined = np.array(frequencies, dtype=float)
+        for i, freq in enumerate(refined):
+            if not np.isfinite(freq):
+                continue
+            f_start = max(self.bin_hz, freq - 2 * self.bin_hz)
+            f_stop = freq + 2 * self.bin_hz
+            zoomed = np.abs(signal.zoom_fft(self.windowed[i], [f_start, f_stop], m=ZOOM_POINTS,
+                                            fs=self.sample_rate, endpoint=True))
+            zoom_hz = (f_stop - f_start) / (ZOOM_POINTS - 1)
+            zoom_idx = int(np.argmax(zoomed))
+            log_zoom = np.log(zoomed + 1e-20)
+            refined[i] = f_start + (zoom_idx + parabolic_peak(log_zoom, zoom_idx)) * zoom_hz
+        return refined
+
+# ==================== DETECTORS ====================
+# Every engine takes a SpectralFrames object and a frequency range and returns
+# (frequency, confidence) arrays with one entry per frame (NaN = no pitch).
+
+Detector = namedtuple('Detector', ['name', 'label', 'func', 'refine'])
+
+DETECTORS = {}
+
+def first_strong_peak(region, strong):
+    """Per-row index of the first local maximum at or after the first strong sample
+
+    Period multiples, rahmonics and later YIN dips score about as well as the
+    period itself, so detectors take the first peak that qualifies rather than
+    the global maximum. strong masks the qualifying samples; a peak may sit on
+    the last column.
+    """
+    first = np.argmax(strong, axis=1)
+    falling = np.ones_like(strong)
+    falling[:, :-1] = region[:, 1:] < region[:, :-1]
+    after_first = np.arange(region.shape[1])[None, :] >= first[:, None]
+    return np.argmax(falling & after_first, axis=1)
+
+def register_detector(name, label, refine=True):
+    """Decorator adding a pitch-detection engine to DETECTORS"""
+    def decorator(func):
+        DETECTORS[name] = Detector(name, label, func, refine)
+        return func
+    return decorator
+
+@register_detector('fft_peak', 'FFT Peak', refine=False)
+def detect_fft_peak(frames, freq_range):
+    """Strongest spectral peak, parabolic-interpolated"""
+    lo, hi = frames.band_bins(freq_range)
+    band = frames.magnitude[:, lo:hi + 1]
+    peak = lo + np.argmax(band, axis=1)
+
+    frequency = parabolic_peaks(frames.log_magnitude, peak) * frames.bin_hz
+    # An empty band (digital silence) has no peak at all, however flat it is
+    top = band.max(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        confidence = np.where(top > 1e-20, 1 - np.median(band, axis=1) / top, 0.0)
+    return frequency, confidence
+
+@register_detector('hps', 'Harmonic Product Spectrum')
+def detect_hps(frames, freq_range, harmonics=HPS_HARMONICS):
+    """Bin whose first few harmonics have the largest summed log magnitude"""
+    lo, hi = frames.band_bins(freq_range)
+    candidates = np.arange(lo, hi + 1)
+    idx = candidates[None, :] * np.arange(1, harmonics + 1)[:, None]
+    idx = np.minimum(idx, frames.magnitude.shape[1] - 1)
+
+    product = frames.log_magnitude[:, idx].sum(axis=1)
+    best = np.argmax(product, axis=1)
+
+    frequency = candidates[best] * frames.bin_hz
+    spread = product.max(axis=1) - np.median(product, axis=1)
+    confidence = 1 - np.exp(-spread / harmonics)
+    return frequency, confidence
+
+@register_detector('autocorrelation', 'Autocorrelation (FFT)')
+def detect_autocorrelation(frames, freq_range):
+    """Highest autocorrelation peak within the allowed lag range"""
+    lo, hi = frames.lag_range(freq_range)
+    acf = frames.autocorrelation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = acf / acf[:, :1]
+    normalized = np.nan_to_num(normalized)
+
+    region = normalized[:, lo:hi + 1]
+    # At low sample rates the true peak falls between lags and a multiple can
+    # edge past it, so take the first strong peak
+    strong = region >= AUTOCORR_PEAK_RATIO * region.max(axis=1, keepdims=True)
+    lag = parabolic_peaks(normalized, lo + first_strong_peak(region, strong))
+
+    frequency = frames.sample_rate / lag
+    confidence = np.clip(normalized[np.arange(len(frames)), np.round(lag).astype(int)], 0, 1)
+    return frequency, confidence
+
+@register_detector('yin', 'YIN')
+def detect_yin(frames, freq_range, threshold=YIN_THRESHOLD):
+    """YIN: first dip of the cumulative mean normalised difference below threshold"""
+    lo, hi = frames.lag_range(freq_range)
+    taus = np.arange(hi + 2)
+    n = frames.frame_size
+
+    # Difference function from the shared autocorrelation and running energies
+    energy = np.concatenate(
+        [np.zeros((len(frames), 1)), np.cumsum(frames.frames ** 2, axis=1)], axis=1
+    )
+    diff = energy[:, n - taus] + (energy[:, n:n + 1] - energy[:, taus]) \
+        - 2 * frames.autocorrelation[:, :hi + 2]
+    diff[:, 0] = 0
+
+    # Cumulative mean normalised difference
+    cmnd = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cmnd[:, 1:] = np.where(running > 0, diff[:, 1:] * taus[1:] / running, 1.0)
+
+    region = cmnd[:, lo:hi + 1]
+    below = region < threshold
+    # Walk from the first sub-threshold lag down to the bottom of that dip
+    dip = first_strong_peak(-region, below)
+    best = np.where(below.any(axis=1), dip, np.argmin(region, axis=1))
+
+    lag = parabolic_peaks(cmnd, lo + best)
+    frequency = frames.sample_rate / lag
+    confidence = np.clip(1 - region[np.arange(len(frames)), best], 0, 1)
+    return frequency, confidence
+
+@register_detector('cepstrum', 'Cepstrum')
+def detect_cepstrum(frames, freq_range):
+    """Strongest real-cepstrum peak within the allowed quefrency range"""
+    lo, hi = frames.lag_range(freq_range)
+    region = frames.cepstrum[:, lo:hi + 1]
+    peak = region.max(axis=1)
+
+    # Rahmonics repeat at multiples of the period
+    strong = region >= CEPSTRUM_PEAK_RATIO * peak[:, None]
+    best = first_strong_peak(region, strong)
+    quefrency = parabolic_peaks(frames.cepstrum, lo + best)
+
+    frequency = frames.sample_rate / quefrency
+    with np.errstate(divide='ignore', invalid='ignore'):
+        confidence = np.clip(1 - np.median(np.abs(region), axis=1) / peak, 0, 1)
+    return frequency, np.nan_to_num(confidence)
+
+# ==================== TARGET BAND ====================
+
+class TargetBandDFT:
+    """Sliding DFT evaluated only on a grid around a target pitch and its harmonics
+
+    Each bin keeps a running sum over the last window_size samples: pushing n
+    samples adds their terms and subtracts those of the n samples leaving the
+    window, so an update costs O(n × bins) instead of an FFT of the whole
+    window. A Hann window is applied in the frequency domain from the two
+    neighbours one resolution step (sample_rate / window_size) away.
+    The band always holds some peak, so one is only reported when its partials
+    carry at least min_share of the window's energy.
+    """
+
+    def __init__(self, sample_rate, target_freq, window_size, span_cents=TARGET_SPAN_CENTS,
+                 harmonics=TARGET_HARMONICS, oversample=TARGET_OVERSAMPLE,
+                 min_share=TARGET_MIN_SHARE):
+        self.sample_rate = sample_rate
+        self.window_size = int(window_size)
+        self.min_share = min_share
+        self.resolution = sample_rate / self.window_size
+        self.step = self.resolution / oversample
+
+        # At least ±2 resolution steps, so a short window still has a peak to interpolate
+        half_span = max(target_freq * (2 ** (span_cents / 1200) - 1), 2 * self.resolution)
+        n_side = int(np.ceil(half_span / self.step))
+        self.candidates = target_freq + self.step * np.arange(-n_side, n_side + 1)
+        self.candidates = self.candidates[self.candidates > self.resolution]
+
+        k = np.arange(1, harmonics + 1)
+        k = k[k * self.candidates[-1] + self.resolution < 0.5 * sample_rate]
+        centres = k[:, None] * self.candidates[None, :]
+        # (3, harmonics, candidates): f - resolution, f, f + resolution
+        self.freqs = centres[None] + self.resolution * np.array([-1, 0, 1])[:, None, None]
+        self.omega = 2 * np.pi * self.freqs.ravel() / sample_rate
+        self.block_size = max(64, TARGET_TWIDDLE_POINTS // len(self.omega))
+        self._twiddles = {}
+        self.reset()
+
+    def reset(self):
+        self.sums = np.zeros(len(self.omega), dtype=complex)
+        self.history = np.zeros(self.window_size, dtype=np.float32)
+        self.position = 0
+
+    def _twiddle(self, n):
+        """e^{-jωm} for m = 0..n-1, cached for the few block lengths a stream uses"""
+        if n not in self._twiddles:
+            if len(self._twiddles) >= 4:
+                self._twiddles.clear()
+            # e^{-jω(32a + b)} = e^{-jω·32a}·e^{-jωb}: two small exp tables instead of n per bin
+            coarse = np.exp(-1j * np.outer(self.omega, np.arange(0, n, 32)))
+            fine = np.exp(-1j * np.outer(self.omega, np.arange(32)))
+            twiddle = (coarse[:, :, None] * fine[:, None, :]).reshape(len(self.omega), -1)
+            self._twiddles[n] = twiddle[:, :n].astype(np.complex64)
+        return self._twiddles[n]
+
+    def _terms(self, samples, start):
+        """Σ x[m]·e^{-jωm} over samples whose first one sits at absolute index start"""
+        total = np.zeros(len(self.omega), dtype=complex)
+        for offset in range(0, len(samples), self.block_size):
+            block = np.asarray(samples[offset:offset + self.block_size], dtype=np.float32)
+            total += (self._twiddle(len(block)) @ block) * np.exp(-1j * self.omega * (start + offset))
+        return total
+
+    def push(self, samples):
+        """Slide the window over the next samples of the stream"""
+        n = len(samples)
+        if n == 0:
+            return
+        if n >= self.window_size:
+            # Copy: callers reuse their window buffer between pushes
+            self.history = np.array(samples[-self.window_size:], dtype=np.float32)
+            self.position += n
+            self.sums = self._terms(self.history, self.position - self.window_size)
+            return
+
+        leaving = self.history[:n]
+        self.sums += self._terms(samples, self.position) \
+            - self._terms(leaving, self.position - self.window_size)
+        self.history = np.concatenate([self.history[n:], np.asarray(samples, dtype=np.float32)])
+        self.position += n
+
+    def harmonic_magnitudes(self):
+        """Hann-windowed magnitude at every (harmonic, candidate) of the current window"""
+        # Phase relative to the window start, as for an FFT of the window
+        start = self.position - self.window_size
+        spectrum = (self.sums * np.exp(1j * self.omega * start)).reshape(self.freqs.shape)
+        return np.abs(0.5 * spectrum[1] - 0.25 * (spectrum[0] + spectrum[2]))
+
+    def estimate(self):
+        """(frequency or None, confidence) of the strongest harmonic-summed candidate"""
+        magnitudes = self.harmonic_magnitudes()
+        score = magnitudes.sum(axis=0)
+        best = int(np.argmax(score))
+        if best == 0 or best == len(score) - 1 or score[best] <= 0:
+            # The pitch lies outside the band (or there is none)
+            return None, 0.0
+
+        # A Hann-windowed sine of amplitude A peaks at A·N/4 and carries A²·N/2,
+        # so a lone partial has share 1; noise or another string's tail has little
+        energy = float(np.dot(self.history, self.history))
+        share = 8 * np.sum(magnitudes[:, best] ** 2) / (self.window_size * energy + 1e-30)
+        if share < self.min_share:
+            return None, 0.0
+
+        # Harmonics pick the peak, the fundamental places it: string partials are
+        # stretched (inharmonic), so the summed score would read slightly sharp
+        lo, hi = max(1, best - 2), min(len(score) - 2, best + 2)
+        peak = lo + int(np.argmax(magnitudes[0, lo:hi + 1]))
+        offset = parabolic_peak(np.log(magnitudes[0] + 1e-20), peak)
+        frequency = self.candidates[peak] + offset * self.step
+        confidence = 1 - np.median(score) / score[best]
+        return float(frequency), float(confidence)
+
+def detect_target_band(audio_data, sample_rate, target_freq, timer=None, **band_params):
+    """Pitch near a known target from a TargetBandDFT over the whole clip
+
+    Returns (frequency or None, confidence) like detect_pitch(); the band DFT
+    is timed as 'band dft'.
+    """
+    if len(audio_data) < 3:
+        return None, 0.0
+    with timed(timer, 'band dft'):
+        band = TargetBandDFT(sample_rate, target_freq, len(audio_data), **band_params)
+        band.push(audio_data)
+        return band.estimate()
+
+# ==================== PHASE VOCODER ====================
+
+StrobeTrack = namedtuple('StrobeTrack', ['frequency', 'error', 'times', 'phase', 'level'])
+
+def estimate_phase_vocoder(audio_data, sample_rate, reference_freq, seconds=VOCODER_SECONDS,
+                           frame_seconds=VOCODER_FRAME_SECONDS, hop_seconds=VOCODER_HOP_SECONDS,
+                           span_cents=VOCODER_SPAN_CENTS, timer=None):
+    """Instantaneous frequency of the partial near reference_freq from its phase advance
+
+    Only the first `seconds` of the clip are used. A zero-padded FFT peak gives
+    a rough frequency; every overlapping frame is then correlated with a
+    Hann-windowed complex exponential at that frequency (one DFT bin per
+    frame), and the phase advance between frames is accumulated. The
+    frequency is the rough one plus the slope of that phase, fitted over the
+    whole excerpt, so precision grows with time instead of FFT length.
+
+    Returns a StrobeTrack or None when no partial is found: error is the
+    standard error of the frequency in Hz, phase is the strobe phase in cycles
+    relative to reference_freq at each frame start (times, in seconds), whose
+    slope is the detune in Hz. Timed as 'phase vocoder'.
+    """
+    with timed(timer, 'phase vocoder'):
+        excerpt = np.asarray(audio_data[:int(seconds * sample_rate)], dtype=np.float64)
+        frame_size = int(frame_seconds * sample_rate)
+        hop_size = max(1, int(hop_seconds * sample_rate))
+        if len(excerpt) < frame_size + 2 * hop_size:
+            return None
+
+        span = 2 ** (span_cents / 1200)
+        rough, _ = detect_pitch(excerpt, sample_rate, 'fft_peak',
+                                freq_range=(reference_freq / span, reference_freq * span))
+        if rough is None:
+            return None
+
+        frames = sliding_window_view(excerpt, frame_size)[::hop_size]
+        omega = 2 * np.pi * rough / sample_rate
+        kernel = signal.get_window('hann', frame_size) * np.exp(-1j * omega * np.arange(frame_size))
+        bins = frames @ kernel
+        level = np.abs(bins)
+        if not level.any():
+            return None
+
+        # Advance beyond what the rough frequency predicts, wrapped to ±half a cycle
+        advance = np.angle(bins[1:] * np.conj(bins[:-1]) * np.exp(-1j * omega * hop_size))
+        phase = np.concatenate([[0.0], np.cumsum(advance)]) / (2 * np.pi)
+        times = np.arange(len(bins)) * hop_size / sample_rate
+
+        # Amplitude-weighted least-squares slope in cycles per second
+        weights = level / level.sum()
+        t_mean, p_mean = weights @ times, weights @ phase
+        dt = times - t_mean
+        slope = (weights @ (dt * (phase - p_mean))) / (weights @ dt ** 2)
+        residual = phase - p_mean - slope * dt
+        dof = max(1, len(times) - 2)
+        # Overlapping frames share their noise, so there are fewer independent
+        # phase readings than frames
+        variance = (weights @ residual ** 2) / (weights @ dt ** 2) / dof
+        error = np.sqrt(variance * frame_size / hop_size)
+
+        strobe = phase + np.angle(bins[0]) / (2 * np.pi) + (rough - reference_freq) * times
+        return StrobeTrack(float(rough + slope), float(error), times, strobe, level)
+
+# ==================== SEGMENTATION ====================
+
+Note = namedtuple('Note', ['onset', 'start', 'end', 'level'])
+
+def onset_strength(audio_data, sample_rate, frame_seconds=ONSET_FRAME_SECONDS,
+                   hop_seconds=ONSET_HOP_SECONDS, compression=ONSET_COMPRESSION):
+    """Frame centre times, RMS level and spectral flux of a clip
+
+    Flux is the mean rise of the log-compressed magnitude spectrum from one
+    frame to the next, so a pluck onset stands out whatever its loudness.
+    The clip is strided down to about ONSET_RATE first: aliasing only moves
+    energy between bins, it does not move onsets in time.
+    """
+    stride = max(1, int(sample_rate // ONSET_RATE))
+    audio_data, sample_rate = audio_data[::stride], sample_rate / stride
+    frame_size = max(3, int(frame_seconds * sample_rate))
+    hop_size = max(1, int(hop_seconds * sample_rate))
+    frames = SpectralFrames(audio_data, sample_rate, frame_size, hop_size, zero_pad=1)
+
+    magnitude = frames.magnitude
+    compressed = np.log1p(compression * magnitude / max(magnitude.max(), 1e-20))
+    # The first frame rises from silence, so a note sounding at the start counts too
+    flux = np.maximum(np.diff(compressed, axis=0, prepend=0), 0).mean(axis=1)
+    return frames.times, frames.level, flux
+
+def segment_notes(audio_data, sample_rate, frame_seconds=ONSET_FRAME_SECONDS,
+                  hop_seconds=ONSET_HOP_SECONDS, delta=ONSET_DELTA, min_gap=ONSET_MIN_GAP,
+                  rise_db=ONSET_RISE_DB, range_db=ONSET_RANGE_DB, silence_db=ONSET_SILENCE_DB,
+                  attack_seconds=ATTACK_SECONDS, decay_db=SUSTAIN_DECAY_DB,
+                  min_sustain=SUSTAIN_MIN_SECONDS):
+    """Split a clip into notes at spectral-flux onsets, return a list of Note
+
+    An onset is a peak of the spectral flux that comes with a level rise of
+    at least rise_db, to within range_db of the loudest frame; a clip that
+    starts mid-note gets an onset on its first frame. Each Note holds its
+    onset and the start / end of its sustain in seconds, plus its peak RMS
+    level. The sustain begins attack_seconds after the level peak and ends
+    when the note falls decay_db below that peak, goes silent or the next
+    note starts. Notes with less than min_sustain seconds are dropped.
+    """
+    if len(audio_data) < 3:
+        return []
+    times, level, flux = onset_strength(audio_data, sample_rate, frame_seconds, hop_seconds)
+    if level.max() <= 0:
+        return []
+    sounding = level >= level.max() * 10 ** (-silence_db / 20)
+
+    # Onsets: flux maxima within ±min_gap that clear the threshold on a sounding frame
+    gap = max(1, int(round(min_gap / hop_seconds)))
+    padded = np.pad(flux, gap, constant_values=-np.inf)
+    local_max = flux >= sliding_window_view(padded, 2 * gap + 1).max(axis=1)
+    threshold = np.median(flux) + delta * (flux.max() - np.median(flux))
+
+    # ... where the level also jumps: noise in a ringing note makes flux, not a rise.
+    # Compare the last frame before the onset with the loudest of the next two frame lengths
+    span = max(1, int(np.ceil(frame_seconds / hop_seconds)))
+    before = np.concatenate([np.zeros(span), level])[:len(level)]
+    after = sliding_window_view(np.pad(level, (0, 2 * span - 1)), 2 * span).max(axis=1)
+    rises = after >= np.maximum(before * 10 ** (rise_db / 20), level.max() * 10 ** (-range_db / 20))
+    onsets = list(np.flatnonzero(local_max & (flux > threshold) & sounding & rises))
+    if sounding[0] and (not onsets or onsets[0] > gap):
+        onsets.insert(0, 0)
+
+    notes = []
+    for onset, next_onset in zip(onsets, onsets[1:] + [len(level)]):
+        peak = onset + int(np.argmax(level[onset:next_onset]))
+        start = peak + int(round(attack_seconds / hop_seconds))
+        if start >= next_onset:
+            continue
+        decayed = (level[start:next_onset] < level[peak] * 10 ** (-decay_db / 20)) \
+            | ~sounding[start:next_onset]
+        end = start + (int(np.argmax(decayed)) if decayed.any() else next_onset - start)
+        if end - start < 1:
+            continue
+        end_time = times[end] if end < len(times) else len(audio_data) / sample_rate
+        note = Note(float(times[onset]), float(times[start]), float(end_time), float(level[peak]))
+        if note.end - note.start >= min_sustain:
+            notes.append(note)
+    return notes
+
+def longest_sustain(audio_data, sample_rate, timer=None, **segment_params):
+    """Sustain of the longest-ringing note as a slice, or None without a note
+
+    Timed as 'segmentation'.
+    """
+    with timed(timer, 'segmentation'):
+        notes = segment_notes(audio_data, sample_rate, **segment_params)
+    if not notes:
+        return None
+    note = max(notes, key=lambda note: note.end - note.start)
+    return slice(int(note.start * sample_rate), int(note.end * sample_rate))
+
+# ==================== FUNCTIONS ====================
+
+def lift_subharmonics(frames, frequency, freq_range, gap_db=SUBHARMONIC_DB,
+                      multiples=SUBHARMONIC_MULTIPLES):
+    """Move estimates that have no partial of their own up to the first multiple that has one
+
+    Period detectors lock onto two or three periods when hum weakens the
+    first, and HPS onto f0 / 2 when the odd harmonics are weak. Such an
+    estimate sits in an empty stretch of spectrum, gap_db or more below a
+    multiple of itself; a real fundamental, even a weak one, does not.
+    """
+    frequency = np.array(frequency, dtype=float)
+    level = frames.partial_level(frequency)
+    gap = gap_db / 20 * np.log(10)
+    pending = np.isfinite(frequency)
+    for k in range(2, multiples + 1):
+        candidate = k * frequency
+        with np.errstate(invalid='ignore'):
+            lift = pending & (candidate <= freq_range[1]) \
+                & (frames.partial_level(candidate) > level + gap)
+        frequency[lift] = candidate[lift]
+        pending &= ~lift
+    return frequency
+
+def estimate_frames(frames, method=DEFAULT_DETECTOR, freq_range=GUITAR_RANGE, zoom=False):
+    """Run a registered detector, return per-frame (frequency, confidence)"""
+    if method not in DETECTORS:
+        raise ValueError(f"Unknown detector '{method}', choose from {sorted(DETECTORS)}")
+    detector = DETECTORS[method]
+
+    frequency, confidence = detector.func(frames, freq_range)
+    if detector.refine:
+        frequency = frames.refine(lift_subharmonics(frames, frequency, freq_range))
+    if zoom:
+        frequency = frames.zoom_refine(frequency)
+
+    out_of_range = ~((frequency >= freq_range[0]) & (frequency <= freq_range[1]))
+    frequency = np.where(out_of_range, np.nan, frequency)
+    confidence = np.where(out_of_range, 0.0, confidence)
+    return frequency, confidence
+
+def detect_pitch(audio_data, sample_rate, method=DEFAULT_DETECTOR, frame_size=None,
+                 hop_size=None, freq_range=GUITAR_RANGE, zero_pad=ZERO_PAD_FACTOR, zoom=False,
+                 timer=None):
+    """Estimate the pitch of a clip, return (frequency or None, confidence)
+
+    Per-frame estimates are pooled with the median of the confident frames;
+    frames with zero confidence count as unvoiced.
+    With a StageTimer the spectrum is timed as 'fft' and the detector as 'peak search'.
+    """
+    if len(audio_data) < 3:
+        return None, 0.0
+    with timed(timer, 'fft'):
+        frames = SpectralFrames(audio_data, sample_rate, frame_size, hop_size, zero_pad)
+        frames.magnitude
+    with timed(timer, 'peak search'):
+        frequency, confidence = estimate_frames(frames, method, freq_range, zoom)
+
+    # Zero confidence means the detector found nothing, e.g. YIN on silence
+    voiced = np.isfinite(frequency) & (confidence > 0)
+    if not voiced.any():
+        return None, 0.0
+    confident = voiced & (confidence >= 0.5 * confidence[voiced].max())
+    return float(np.median(frequency[confident])), float(np.median(confidence[confident]))
+
+def detect_frequency(filtered_audio, sample_rate, target_freq, method=DEFAULT_DETECTOR,
+                     zero_pad=ZERO_PAD_FACTOR, zoom=False, target_band=False, timer=None):
+    """detect_pitch(), or detect_target_band() when target_band is set and there is a target"""
+    if target_band and target_freq:
+        return detect_target_band(filtered_audio, sample_rate, target_freq, timer=timer)
+    return detect_pitch(filtered_audio, sample_rate, method, zero_pad=zero_pad, zoom=zoom,
+                        timer=timer)
+
+def filter_clip(audio_data, sample_rate, target_freq=None, causal=False, timer=None,
+                decimate=False, filter_params=None, adaptive_hum=False,
+                tuning=STRING_FREQUENCIES):
+    """Front end shared by process_audio() and process_notes(), return (filtered, sample_rate)
+
+    Decimates first when asked, then runs a FilterChain over the whole clip
+    (or as one causal chunk); the returned rate is the working rate.
+    """
+    if decimate:
+        with timed(timer, 'decimation'):
+            audio_data, sample_rate = decimate_audio(audio_data, sample_rate)
+    with timed(timer, 'filter design'):
+        chain = FilterChain(sample_rate, adaptive_hum, target_freq, tuning,
+                            **(filter_params or {}))
+    with timed(timer, 'filtering'):
+        if causal:
+            return chain.filter_chunk(audio_data), sample_rate
+        return chain.filter_offline(audio_data), sample_rate
+
+def process_notes(audio_data, sample_rate, target_freq=None, zero_pad=ZERO_PAD_FACTOR,
+                  zoom=False, method=DEFAULT_DETECTOR, timer=None, decimate=False,
+                  filter_params=None, adaptive_hum=False, target_band=False,
+                  tuning=STRING_FREQUENCIES):
+    """Filter a clip once and detect the pitch of every note's sustain
+
+    Returns a list of (Note, frequency or None, confidence), e.g. for a long
+    recording of several plucks. Options are those of process_audio().
+    """
+    filtered_audio, sample_rate = filter_clip(
+        audio_data, sample_rate, target_freq, timer=timer, decimate=decimate,
+        filter_params=filter_params, adaptive_hum=adaptive_hum, tuning=tuning
+    )
+    with timed(timer, 'segmentation'):
+        notes = segment_notes(filtered_audio, sample_rate)
+
+    readings = []
+    for note in notes:
+        sustain = filtered_audio[int(note.start * sample_rate):int(note.end * sample_rate)]
+        frequency, confidence = detect_frequency(sustain, sample_rate, target_freq, method,
+                                                 zero_pad, zoom, target_band, timer)
+        readings.append((note, frequency, confidence))
+    return readings
+
+def process_audio(audio_data, sample_rate, target_freq, causal=False,
+                  zero_pad=ZERO_PAD_FACTOR, zoom=False, method=DEFAULT_DETECTOR, timer=None,
+                  decimate=False, filter_params=None, adaptive_hum=False, target_band=False,
+                  segment=False, tuning=STRING_FREQUENCIES):
+    """Process audio with DSP filters and detect frequency
+
+    An optional StageTimer records filter design, filtering, fft and peak search.
+    With decimate=True the clip is first decimated to DECIMATE_RATE and the
+    filtered audio is returned at that working rate (see decimation_factor).
+    filter_params overrides the FilterBank.get design (notch_q, lowpass_cutoff, ...).
+    adaptive_hum=True swaps the fixed 50 Hz notch for a HumCanceller, which spares
+    target_freq, or every string of tuning when target_freq is None.
+    target_band=True only searches around target_freq and its harmonics with a
+    TargetBandDFT instead of the full spectrum (method and zoom are then unused).
+    segment=True only analyses the sustain of the longest note (see segment_notes),
+    skipping leading silence, the pluck attack and the decaying tail; the whole
+    filtered clip is still returned.
+    """
+    try:
+        filtered_audio, sample_rate = filter_clip(
+            audio_data, sample_rate, target_freq, causal, timer, decimate, filter_params,
+            adaptive_hum, tuning
+        )
+
+        analysed = filtered_audio
+        if segment:
+            sustain = longest_sustain(filtered_audio, sample_rate, timer=timer)
+            if sustain is None:
+                return None, None, "No note found above the silence threshold"
+            analysed = filtered_audio[sustain]
+
+        dominant_freq, _ = detect_frequency(analysed, sample_rate, target_freq, method, zero_pad,
+                                            zoom, target_band, timer)
+        if dominant_freq is None:
+            return None, None, "No frequency detected in guitar range"
+
+        return filtered_audio, dominant_freq, "Success"
+
+    except Exception as e:
+        return None, None, str(e)
+
+SpectrumAnalysis = namedtuple('SpectrumAnalysis', ['freqs', 'raw_magnitude', 'filtered_magnitude'])
+
+def audio_fingerprint(audio_data):
+    """Content hash of an audio buffer, used as a cache key"""
+    audio = np.ascontiguousarray(audio_data)
+    digest = hashlib.blake2b(audio.view(np.uint8), digest_size=16)
+    digest.update(str((audio.dtype, audio.shape)).encode())
+    return digest.hexdigest()
+
+def magnitude_spectrum(audio_data, sample_rate):
+    """Positive-frequency rfft magnitude of a signal"""
+    magnitude = np.abs(rfft(audio_data))
+    freqs = rfftfreq(len(audio_data), 1/sample_rate)
+    return freqs[1:], magnitude[1:]
+
+def waveform_envelope(audio_data, sample_rate, points=WAVEFORM_POINTS):
+    """Per-bucket min/max of a clip for plotting, return (times, lower, upper)
+
+    The whole clip is reduced to at most `points` buckets, so drawing cost does
+    not grow with its length. Short clips are returned sample by sample.
+    """
+    audio = np.asarray(audio_data)
+    if len(audio) <= 2 * points:
+        times = np.arange(len(audio)) / sample_rate
+        return times, audio, audio
+
+    edges = np.linspace(0, len(audio), points + 1).astype(int)
+    lower = np.minimum.reduceat(audio, edges[:-1])
+    upper = np.maximum.reduceat(audio, edges[:-1])
+    times = (edges[:-1] + edges[1:]) / 2 / sample_rate
+    return times, lower, upper
+
+def get_tuning_status(detected_freq, target_freq):
+    """Get tuning status"""
+    diff = detected_freq - target_freq
+
+    if abs(diff) <= TUNE_TOLERANCE:
+        return "IN TUNE ✓", "success", "#00d084", "status-in-tune"
+    elif diff > 0:
+        return "SHARP ↑", "warning", "#ff6b6b", "status-sharp"
+    else:
+        return "FLAT ↓", "info", "#4facfe", "status-flat"
+
+def identify_strings(frequencies, tuning=STRING_FREQUENCIES):
+    """Nearest string of a tuning for every frequency, return (names, targets, cents) arrays"""
+    names = np.array(list(tuning.keys()))
+    targets = np.array(list(tuning.values()), dtype=float)
+    freqs = np.atleast_1d(np.asarray(frequencies, dtype=float))
+
+    cents = 1200 * np.log2(freqs[:, None] / targets[None, :])
+    nearest = np.argmin(np.abs(cents), axis=1)
+    return names[nearest], targets[nearest], cents[np.arange(len(freqs)), nearest]
+
+def identify_string(frequency, tuning=STRING_FREQUENCIES):
+    """Nearest string of a tuning, return (name, target_freq, cents)"""
+    names, targets, cents = identify_strings([frequency], tuning)
+    return str(names[0]), float(targets[0]), float(cents[0])
+
+def calculate_cents(detected_freq, target_freq):
+    """Calculate cents deviation"""
+    if detected_freq <= 0 or target_freq <= 0:
+        return 0
+    return 1200 * np.log2(detected_freq / target_freq)
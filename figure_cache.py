@@ -0,0 +1,73 @@
+"""
+🎸 Guitar Tuner Pro - Figure Cache
+Rendered matplotlib figures memoized as PNG bytes with LRU eviction
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+# ==================== SETTINGS ====================
+FIGURE_CACHE_ENTRIES = 64
+FIGURE_CACHE_BYTES = 48 * 2 ** 20   # memory cap for all cached PNGs
+FIGURE_DPI = 200                    # same resolution st.pyplot renders at
+FIGURE_MAX_WIDTH = 1460             # wider PNGs are resized and re-encoded by st.image on every rerun
+
+# ==================== CACHE ====================
+
+class FigureCache:
+    """Bounded LRU store of rendered figures keyed by (view, analysis hash, display params)
+
+    Entries are evicted oldest first when either the entry count or the total
+    PNG size exceeds its limit. Shared by every session of the app process.
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_ENTRIES, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """PNG bytes for a key, or None on a miss"""
+        with self._lock:
+            png = self._images.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, fig):
+        """Render and close a figure, store it under key and return the PNG bytes"""
+        buffer = io.BytesIO()
+        dpi = min(FIGURE_DPI, FIGURE_MAX_WIDTH / fig.get_figwidth())
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+        png = buffer.getvalue()
+
+        with self._lock:
+            if key in self._images:
+                self.nbytes -= len(self._images.pop(key))
+            if len(png) <= self.max_bytes:
+                self._images[key] = png
+                self.nbytes += len(png)
+            while len(self._images) > self.max_entries or self.nbytes > self.max_bytes:
+                self.nbytes -= len(self._images.popitem(last=False)[1])
+        return png
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._images)
+
+FIGURE_CACHE = FigureCache()
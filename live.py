@@ -0,0 +1,296 @@
+"""
+🎸 Guitar Tuner Pro - Live Tuner
+Audio sources (microphone or file stand-in) feeding a preallocated ring buffer,
+analysed hop by hop with the same DSP chain as the uploaded-file path
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from audio_io import iter_audio_blocks
+from dsp import (
+    STRING_FREQUENCIES, DEFAULT_DETECTOR, FilterChain, TargetBandDFT, detect_pitch,
+    identify_string, calculate_cents, get_tuning_status
+)
+
+# ==================== SETTINGS ====================
+LIVE_WINDOW_SECONDS = 0.25
+LIVE_HOP_SECONDS = 0.04     # 25 updates per second
+LIVE_BLOCK_SIZE = 256
+LIVE_MIN_LEVEL = 1e-3       # RMS below which a window is silence (-60 dBFS)
+
+LiveReading = namedtuple(
+    'LiveReading',
+    ['frequency', 'string', 'target_freq', 'cents', 'status_text', 'status_color',
+     'level', 'timestamp']
+)
+
+# ==================== RING BUFFER ====================
+
+class AudioRingBuffer:
+    """Preallocated mono ring buffer shared between a capture thread and the analyser"""
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.total_written = 0
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self._write_pos = 0
+        self._lock = threading.Lock()
+
+    def write(self, block):
+        """Append a block, overwriting the oldest samples"""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        n_total = len(block)
+        if n_total > self.capacity:
+            block = block[-self.capacity:]
+        n = len(block)
+
+        with self._lock:
+            end = self._write_pos + n
+            if end <= self.capacity:
+                self._data[self._write_pos:end] = block
+            else:
+                first = self.capacity - self._write_pos
+                self._data[self._write_pos:] = block[:first]
+                self._data[:n - first] = block[first:]
+            self._write_pos = end % self.capacity
+            self.total_written += n_total
+
+    def read_latest(self, n, out=None):
+        """Copy the newest n samples (oldest first) into out"""
+        n = min(int(n), self.capacity)
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+
+        with self._lock:
+            start = (self._write_pos - n) % self.capacity
+            if start + n <= self.capacity:
+                out[:] = self._data[start:start + n]
+            else:
+                first = self.capacity - start
+                out[:first] = self._data[start:]
+                out[first:] = self._data[:n - first]
+        return out
+
+# ==================== STREAMING TUNER ====================
+
+class StreamingTuner:
+    """Filter a live stream causally and analyse the newest window once per hop
+
+    With target_freq=None every reading is matched to the nearest string of tuning.
+    adaptive_hum=True tracks the mains hum across chunks (see HumCanceller).
+    target_band=True (with a target) replaces the per-hop FFT by a sliding
+    TargetBandDFT around the target, updated with only the samples of each hop.
+    level is the RMS of the newest window, whether or not it held a pitch;
+    windows quieter than min_level give no reading.
+    """
+
+    def __init__(self, sample_rate, target_freq,
+                 window_seconds=LIVE_WINDOW_SECONDS, hop_seconds=LIVE_HOP_SECONDS,
+                 zoom=False, method=DEFAULT_DETECTOR, tuning=STRING_FREQUENCIES,
+                 adaptive_hum=False, target_band=False, min_level=LIVE_MIN_LEVEL):
+        self.sample_rate = int(sample_rate)
+        self.min_level = min_level
+        self.target_freq = target_freq
+        self.zoom = zoom
+        self.method = method
+        self.tuning = tuning
+        self.window_size = int(window_seconds * self.sample_rate)
+        self.hop_size = max(1, int(hop_seconds * self.sample_rate))
+        self.filter_chain = FilterChain(self.sample_rate, adaptive_hum, target_freq, tuning)
+
+        # Filtered audio, with slack so a late analyser never reads samples being overwritten
+        self.buffer = AudioRingBuffer(2 * self.window_size)
+        self.latest = None
+        self.level = 0.0
+
+        self._window = np.zeros(self.window_size, dtype=np.float32)
+        self._next_hop_at = self.window_size
+        self.band = None
+        if target_band and target_freq is not None:
+            self.band = TargetBandDFT(self.sample_rate, target_freq, self.window_size)
+        self._band_written = 0
+        self._hop_ready = threading.Event()
+
+    def push(self, block):
+        """Filter and buffer captured samples (safe to call from an audio callback)"""
+        self.buffer.write(self.filter_chain.filter_chunk(block))
+        if self.buffer.total_written >= self._next_hop_at:
+            self._hop_ready.set()
+
+    def wait_for_hop(self, timeout=None):
+        """Block until a full hop of new audio is buffered"""
+        ready = self._hop_ready.wait(timeout)
+        self._hop_ready.clear()
+        return ready
+
+    def process_hop(self):
+        """Analyse the newest window if a hop is due, return a LiveReading or None"""
+        written = self.buffer.total_written
+        if written < self._next_hop_at:
+            return None
+
+        # Skip hops we fell behind on rather than queueing them up
+        self._next_hop_at = written + self.hop_size
+
+        window = self.buffer.read_latest(self.window_size, out=self._window)
+        self.level = float(np.sqrt(np.mean(window ** 2)))
+        if self.band is not None:
+            # Kept sliding through silence so it is current when a note starts
+            new = min(written - self._band_written, self.window_size)
+            self._band_written = written
+            self.band.push(window[self.window_size - new:])
+        if self.level < self.min_level:
+            return None
+
+        if self.band is not None:
+            freq, _ = self.band.estimate()
+        else:
+            freq, _ = detect_pitch(window, self.sample_rate, self.method, zoom=self.zoom)
+        if freq is None:
+            return None
+
+        if self.target_freq is None:
+            string, target_freq, _ = identify_string(freq, self.tuning)
+        else:
+            string, target_freq = None, self.target_freq
+
+        status_text, _, status_color, _ = get_tuning_status(freq, target_freq)
+        self.latest = LiveReading(
+            frequency=freq,
+            string=string,
+            target_freq=target_freq,
+            cents=calculate_cents(freq, target_freq),
+            status_text=status_text,
+            status_color=status_color,
+            level=self.level,
+            timestamp=time.perf_counter()
+        )
+        return self.latest
+
+# ==================== AUDIO SOURCES ====================
+
+class MicrophoneSource:
+    """sounddevice input stream pushing blocks into a callback"""
+
+    def __init__(self, sample_rate=None, device=None, blocksize=LIVE_BLOCK_SIZE):
+        # PortAudio is only needed for live capture, not for the rest of the app
+        import sounddevice as sd
+
+        self._sd = sd
+        self.device = device
+        self.blocksize = blocksize
+        if sample_rate is None:
+            sample_rate = sd.query_devices(device, 'input')['default_samplerate']
+        self.sample_rate = int(sample_rate)
+        self._stream = None
+
+    def start(self, on_block):
+        def callback(indata, frames, time_info, status):
+            on_block(indata[:, 0])
+
+        self._stream = self._sd.InputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.blocksize,
+            device=self.device,
+            channels=1,
+            dtype='float32',
+            callback=callback
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    @property
+    def active(self):
+        return self._stream is not None and self._stream.active
+
+
+class FileSource:
+    """Stand-in for MicrophoneSource that plays a file or array block by block
+
+    A path or file-like source is decoded chunk by chunk while it plays
+    (see iter_audio_blocks), so a long recording is never held in memory.
+    """
+
+    def __init__(self, source, sample_rate=None, blocksize=LIVE_BLOCK_SIZE,
+                 realtime=True, loop=False):
+        if isinstance(source, np.ndarray):
+            if sample_rate is None:
+                raise ValueError("sample_rate is required for array sources")
+            self.data = np.asarray(source, dtype=np.float32)
+        else:
+            # One frame is enough to learn the rate; playback decodes from the start
+            self.data = None
+            first = next(iter_audio_blocks(source, max_seconds=None, blocksize=1), None)
+            if first is None:
+                raise ValueError("No audio frames could be decoded")
+            sample_rate = first[1]
+
+        self.source = source
+        self.sample_rate = int(sample_rate)
+        self.blocksize = blocksize
+        self.realtime = realtime
+        self.loop = loop
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _pass(self):
+        """Blocks of one pass through the recording"""
+        if self.data is not None:
+            chunks = [self.data]
+        else:
+            chunks = (chunk for chunk, _ in iter_audio_blocks(self.source, max_seconds=None))
+        for chunk in chunks:
+            for start in range(0, len(chunk), self.blocksize):
+                yield chunk[start:start + self.blocksize]
+
+    def blocks(self):
+        """Yield consecutive blocks of the recording"""
+        while True:
+            yield from self._pass()
+            if not self.loop:
+                return
+
+    def start(self, on_block):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._play, args=(on_block,), daemon=True)
+        self._thread.start()
+
+    def _play(self, on_block):
+        block_seconds = self.blocksize / self.sample_rate
+        next_time = time.perf_counter()
+        for block in self.blocks():
+            if self._stop.is_set():
+                break
+            on_block(block)
+            if self.realtime:
+                next_time += block_seconds
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def active(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, tuner):
+        """Drive a tuner synchronously through the whole file, return every reading"""
+        readings = []
+        for block in self._pass():
+            tuner.push(block)
+            reading = tuner.process_hop()
+            if reading is not None:
+                readings.append(reading)
+        return readings
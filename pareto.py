@@ -0,0 +1,205 @@
+"""
+🎸 Guitar Tuner Pro - Accuracy vs Latency Sweep
+Pareto table of detection error, processing time and audio needed per configuration
+
+Usage:
+    python pareto.py
+    python pareto.py --tolerance 0.05 --detectors fft_peak yin -o sweep.json
+    python pareto.py --manifest recordings.csv --windows 0.5 1 2
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from audio_io import load_audio
+from benchmark import synth_pluck, environment
+from dsp import STRING_FREQUENCIES, DETECTORS, process_audio, calculate_cents
+
+# ==================== SETTINGS ====================
+SWEEP_WINDOWS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0)     # seconds of audio analysed
+SWEEP_DETUNE_CENTS = (-30, -7, 0, 12, 40)
+SWEEP_SAMPLE_RATE = 44100
+SWEEP_DURATION = 3.0
+SWEEP_TOLERANCE_HZ = 0.1        # the "±0.1 Hz" the app advertises
+
+FILTER_PRESETS = {
+    'default': {},
+    'wide lowpass': {'lowpass_cutoff': 1000},
+    'gentle': {'notch_q': 10, 'lowpass_order': 2},
+    'adaptive hum': {'adaptive_hum': True},
+}
+
+Config = namedtuple('Config', ['window', 'method', 'filters', 'decimate', 'zoom'])
+
+Sample = namedtuple('Sample', ['name', 'audio_data', 'sample_rate', 'true_freq', 'target_freq'])
+
+# ==================== CORPUS ====================
+
+def synthetic_corpus(detune_cents=SWEEP_DETUNE_CENTS, sample_rate=SWEEP_SAMPLE_RATE,
+                     duration=SWEEP_DURATION, strings=STRING_FREQUENCIES):
+    """Plucks of every string, detuned by each offset, labelled with the true pitch"""
+    samples = []
+    for i, (name, target) in enumerate(strings.items()):
+        for j, offset in enumerate(detune_cents):
+            audio_data, true_freq = synth_pluck(target * 2 ** (offset / 1200), sample_rate,
+                                                duration, hum_freq=(50, 60)[j % 2], seed=i * 31 + j)
+            samples.append(Sample(f"{name.split(' ')[0]} {offset:+d}c", audio_data, sample_rate,
+                                  true_freq, target))
+    return samples
+
+def manifest_corpus(manifest, max_seconds=max(SWEEP_WINDOWS)):
+    """Recordings listed in a CSV with 'file' and 'frequency' columns (paths relative to it)
+
+    An optional 'target' column names the target frequency, otherwise the
+    labelled frequency is used.
+    """
+    root = Path(manifest).parent
+    samples = []
+    with open(manifest, newline='') as manifest_file:
+        for row in csv.DictReader(manifest_file):
+            audio_data, sample_rate = load_audio(root / row['file'], max_seconds=max_seconds)
+            frequency = float(row['frequency'])
+            samples.append(Sample(row['file'], audio_data, sample_rate, frequency,
+                                  float(row.get('target') or frequency)))
+    return samples
+
+# ==================== SWEEP ====================
+
+def evaluate(config, samples, tolerance=SWEEP_TOLERANCE_HZ):
+    """Run one configuration over the corpus, return a result row"""
+    errors_hz, errors_cents, times_ms = [], [], []
+    for sample in samples:
+        audio_data = sample.audio_data[:int(config.window * sample.sample_rate)]
+        filter_params = dict(FILTER_PRESETS[config.filters])
+        adaptive_hum = filter_params.pop('adaptive_hum', False)
+        start = time.perf_counter()
+        _, detected_freq, _ = process_audio(
+            audio_data, sample.sample_rate, sample.target_freq, zoom=config.zoom,
+            method=config.method, decimate=config.decimate, filter_params=filter_params,
+            adaptive_hum=adaptive_hum
+        )
+        times_ms.append((time.perf_counter() - start) * 1000)
+        if detected_freq is None:
+            errors_hz.append(np.inf)
+            errors_cents.append(np.inf)
+        else:
+            errors_hz.append(abs(detected_freq - sample.true_freq))
+            errors_cents.append(abs(float(calculate_cents(detected_freq, sample.true_freq))))
+
+    errors_hz = np.array(errors_hz)
+    errors_cents = np.array(errors_cents)
+    return {
+        **config._asdict(),
+        'p95_error_hz': float(np.percentile(errors_hz, 95)),
+        'max_error_hz': float(np.max(errors_hz)),
+        'p95_error_cents': float(np.percentile(errors_cents, 95)),
+        'within_tolerance': float(np.mean(errors_hz <= tolerance)),
+        'median_ms': float(np.median(times_ms)),
+        'meets_tolerance': bool(np.all(errors_hz <= tolerance))
+    }
+
+def sweep(samples, windows=SWEEP_WINDOWS, methods=tuple(DETECTORS), filters=tuple(FILTER_PRESETS),
+          decimate=(False, True), zoom=(False, True), tolerance=SWEEP_TOLERANCE_HZ):
+    """Evaluate every configuration in the grid, yielding result rows"""
+    for values in itertools.product(windows, methods, filters, decimate, zoom):
+        yield evaluate(Config(*values), samples, tolerance)
+
+def pareto_front(rows, objectives=('p95_error_hz', 'median_ms', 'window')):
+    """Rows not dominated on every objective by another row (lower is better)"""
+    points = np.array([[row[name] for name in objectives] for row in rows], dtype=float)
+    # Errors below a millihertz are noise, not a reason to keep a slower configuration
+    points[:, 0] = np.round(points[:, 0], 3)
+    front = []
+    for i, point in enumerate(points):
+        dominated = np.all(points <= point, axis=1) & np.any(points < point, axis=1)
+        if not dominated.any():
+            front.append(rows[i])
+    return sorted(front, key=lambda row: (row['p95_error_hz'], row['median_ms']))
+
+def fastest_within(rows, tolerance=SWEEP_TOLERANCE_HZ):
+    """Cheapest configuration whose worst error stays within tolerance, or None"""
+    passing = [row for row in rows if row['max_error_hz'] <= tolerance]
+    return min(passing, key=lambda row: (row['median_ms'], row['window']), default=None)
+
+def format_table(rows):
+    lines = [f"{'window':>7} {'detector':<16} {'filters':<13} {'decim':<5} {'zoom':<5} "
+             f"{'p95 Hz':>8} {'p95 cents':>9} {'in tol':>6} {'ms':>7}"]
+    for row in rows:
+        lines.append(
+            f"{row['window']:>6.2f}s {row['method']:<16} {row['filters']:<13} "
+            f"{'yes' if row['decimate'] else 'no':<5} {'yes' if row['zoom'] else 'no':<5} "
+            f"{row['p95_error_hz']:>8.3f} {row['p95_error_cents']:>9.2f} "
+            f"{100 * row['within_tolerance']:>5.0f}% {row['median_ms']:>7.2f}"
+        )
+    return '\n'.join(lines)
+
+# ==================== CLI ====================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sweep detector and filter configurations for accuracy against latency"
+    )
+    parser.add_argument('--windows', type=float, nargs='+', default=list(SWEEP_WINDOWS),
+                        help="Seconds of audio analysed (default: %(default)s)")
+    parser.add_argument('--detectors', nargs='+', choices=list(DETECTORS.keys()),
+                        default=list(DETECTORS.keys()), help="Detectors to sweep")
+    parser.add_argument('--filters', nargs='+', choices=list(FILTER_PRESETS.keys()),
+                        default=list(FILTER_PRESETS.keys()), help="Filter presets to sweep")
+    parser.add_argument('--no-decimate', action='store_true',
+                        help="Only sweep the full-rate front end")
+    parser.add_argument('--no-zoom', action='store_true', help="Only sweep without zoom refinement")
+    parser.add_argument('--tolerance', type=float, default=SWEEP_TOLERANCE_HZ,
+                        help="Allowed error in Hz (default: %(default)s)")
+    parser.add_argument('--manifest', action='append', default=[],
+                        help="CSV of labelled recordings (file,frequency[,target]); repeatable")
+    parser.add_argument('--no-synthetic', action='store_true',
+                        help="Only use --manifest recordings")
+    parser.add_argument('-o', '--output', default=None, help="Write every result row to JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    samples = [] if args.no_synthetic else synthetic_corpus()
+    for manifest in args.manifest:
+        samples.extend(manifest_corpus(manifest, max(args.windows)))
+    if not samples:
+        print("Empty corpus", file=sys.stderr)
+        return 1
+
+    rows = list(sweep(
+        samples, args.windows, args.detectors, args.filters,
+        decimate=(False,) if args.no_decimate else (False, True),
+        zoom=(False,) if args.no_zoom else (False, True),
+        tolerance=args.tolerance
+    ))
+
+    print(f"Pareto front over {len(rows)} configurations x {len(samples)} clips "
+          f"(p95 error, time, audio needed):")
+    print(format_table(pareto_front(rows)))
+
+    best = fastest_within(rows, args.tolerance)
+    if best is None:
+        print(f"\nNo configuration keeps every clip within ±{args.tolerance} Hz")
+    else:
+        print(f"\nFastest within ±{args.tolerance} Hz on every clip:")
+        print(format_table([best]))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'environment': environment(), 'tolerance_hz': args.tolerance,
+                       'clips': [sample.name for sample in samples], 'results': rows},
+                      output, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+🎸 Guitar Tuner Pro - Polyphonic Analysis
+All six string deviations from a single strummed chord
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy import signal
+
+from dsp import STRING_FREQUENCIES, FILTER_BANK, SpectralFrames, parabolic_peaks
+
+# ==================== SETTINGS ====================
+STRUM_SEARCH_CENTS = 80         # how far a string may be out of tune
+STRUM_HARMONICS = 6             # partials used to group peaks into strings
+STRUM_MATCH_CENTS = 4           # tolerance when matching a partial to a peak
+STRUM_STRETCH_CENTS = 0.15      # extra tolerance per partial² for string inharmonicity
+STRUM_PEAK_FLOOR_DB = 50        # ignore peaks this far below the strongest
+STRUM_EXPLAINED_WEIGHT = 0.1    # weight of a peak already claimed as a lower string's partial
+STRUM_OWN_PARTIALS = 2          # unclaimed partials needed when the fundamental is claimed
+STRUM_MIN_CONFIDENCE = 0.3      # readings below this are shown as uncertain
+
+StringReading = namedtuple(
+    'StringReading', ['string', 'target_freq', 'frequency', 'cents', 'confidence']
+)
+
+# ==================== FUNCTIONS ====================
+
+def find_spectral_peaks(frames, freq_range, floor_db=STRUM_PEAK_FLOOR_DB):
+    """Interpolated local maxima of the first frame's spectrum, return (freqs, magnitudes)"""
+    lo, hi = frames.band_bins(freq_range)
+    magnitude = frames.magnitude[0]
+    band = magnitude[lo:hi + 1]
+
+    is_peak = (band[1:-1] > band[:-2]) & (band[1:-1] >= band[2:])
+    idx = lo + 1 + np.flatnonzero(is_peak)
+    if len(idx) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    floor = magnitude[idx].max() * 10 ** (-floor_db / 20)
+    idx = idx[magnitude[idx] >= floor]
+
+    log_mag = np.broadcast_to(frames.log_magnitude[0], (len(idx), magnitude.shape[0]))
+    freqs = parabolic_peaks(log_mag, idx) * frames.bin_hz
+    return freqs, magnitude[idx]
+
+def analyze_strum(audio_data, sample_rate, tuning=STRING_FREQUENCIES,
+                  search_cents=STRUM_SEARCH_CENTS, harmonics=STRUM_HARMONICS,
+                  frames=None):
+    """Estimate the pitch of every string of a tuning from one strummed chord
+
+    Spectral peaks are grouped into harmonic series from the lowest string up.
+    Each string takes the candidate near its target with the most harmonic
+    support, and peaks already explained as partials of a lower string only
+    count a little, so B3/E4 are not stolen by the E2/A2 overtones. A string
+    whose candidate is itself such an overtone needs STRUM_OWN_PARTIALS
+    unclaimed partials, otherwise it is silent or too far out to find.
+    Returns one StringReading per string (frequency NaN when not found).
+    """
+    if frames is None:
+        # Hum notch only: the 500 Hz lowpass would remove the partials used for grouping
+        notch_sos = FILTER_BANK.get(sample_rate).sos[:1]
+        frames = SpectralFrames(signal.sosfiltfilt(notch_sos, audio_data), sample_rate)
+
+    targets = np.array(list(tuning.values()), dtype=float)
+    span = 2 ** (search_cents / 1200)
+    peak_freqs, peak_mags = find_spectral_peaks(
+        frames, (targets.min() / span, min(targets.max() * span * harmonics,
+                                           0.45 * sample_rate))
+    )
+    if len(peak_freqs):
+        peak_mags = peak_mags / peak_mags.max()
+    explained = np.zeros(len(peak_freqs), dtype=bool)
+    partials = np.arange(1, harmonics + 1)
+
+    readings = []
+    for name in sorted(tuning, key=tuning.get):
+        target = tuning[name]
+        candidates = np.flatnonzero(np.abs(1200 * np.log2(peak_freqs / target)) <= search_cents)
+        if len(candidates) == 0:
+            readings.append(StringReading(name, target, np.nan, np.nan, 0.0))
+            continue
+
+        # Cents distance between every candidate's partials and every peak
+        series = peak_freqs[candidates, None] * partials[None, :]
+        distance = np.abs(1200 * np.log2(series[:, :, None] / peak_freqs[None, None, :]))
+        tolerance = STRUM_MATCH_CENTS + STRUM_STRETCH_CENTS * partials ** 2
+        matched = distance <= tolerance[None, :, None]
+
+        weights = np.where(explained, STRUM_EXPLAINED_WEIGHT, 1.0) * peak_mags
+        support = np.where(matched, weights[None, None, :], 0).max(axis=2)
+        score = (support / partials[None, :]).sum(axis=1)
+
+        best = int(np.argmax(score))
+        chosen = candidates[best]
+        own = (matched[best] & ~explained[None, :]).any(axis=1)
+        if explained[chosen] and own.sum() < STRUM_OWN_PARTIALS:
+            # A lower string's overtone: this string is silent or further out than search_cents
+            readings.append(StringReading(name, target, np.nan, np.nan, 0.0))
+            continue
+        explained |= matched[best, 1:].any(axis=0)
+
+        frequency = float(peak_freqs[chosen])
+        confidence = float(min(1.0, score[best] / score.sum())) * float(peak_mags[chosen] > 0)
+        readings.append(StringReading(
+            name, target, frequency, 1200 * np.log2(frequency / target), confidence
+        ))
+
+    order = {name: i for i, name in enumerate(tuning)}
+    return sorted(readings, key=lambda reading: order[reading.string])
@@ -0,0 +1,73 @@
+"""
+🎸 Guitar Tuner Pro - Profiling
+Wall-clock timing of analysis stages and a structured performance log
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# ==================== SETTINGS ====================
+PERF_LOGGER = logging.getLogger('guitar_tuner.perf')
+
+ANALYSIS_STAGES = ['decode', 'filter design', 'filtering', 'fft', 'peak search', 'plotting']
+
+# ==================== TIMER ====================
+
+class StageTimer:
+    """Accumulates the wall time of named stages in milliseconds
+
+    on_stage(name, timer) is called after every stage, e.g. to move a progress bar.
+    """
+
+    def __init__(self, on_stage=None):
+        self.stages = OrderedDict()
+        self.on_stage = on_stage
+        self._started = {}
+
+    def add(self, name, elapsed_ms):
+        """Record a stage measured elsewhere"""
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+        if self.on_stage is not None:
+            self.on_stage(name, self)
+
+    def start(self, name):
+        self._started[name] = time.perf_counter()
+
+    def stop(self, name):
+        self.add(name, (time.perf_counter() - self._started.pop(name)) * 1000)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the body of a with-block as one stage"""
+        self.start(name)
+        try:
+            yield self
+        finally:
+            self.stop(name)
+
+    @property
+    def total_ms(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        return {name: round(ms, 3) for name, ms in self.stages.items()}
+
+    def log(self, event='analysis', logger=PERF_LOGGER, **context):
+        """Emit one JSON record with the stage timings and any context fields"""
+        record = {'event': event, **context, 'stages_ms': self.as_dict(),
+                  'total_ms': round(self.total_ms, 3)}
+        logger.info(json.dumps(record))
+        return record
+
+def timed(timer, name):
+    """timer.stage(name), or a no-op when no timer is given"""
+    if timer is None:
+        return _untimed()
+    return timer.stage(name)
+
+@contextmanager
+def _untimed():
+    yield None
@@ -0,0 +1,93 @@
+"""
+🎸 Guitar Tuner Pro - Pitch Tracking
+Short-time pitch, confidence and cents over the whole clip
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from dsp import (
+    DEFAULT_DETECTOR, GUITAR_RANGE, FilterChain, SpectralFrames, estimate_frames
+)
+
+# ==================== SETTINGS ====================
+TRACK_FRAME_SECONDS = 0.1
+TRACK_HOP_SECONDS = 0.02
+TRACK_ZERO_PAD = 2
+TRACK_MIN_CONFIDENCE = 0.5      # relative to the most confident frame
+TRACK_STABLE_CENTS = 5          # largest frame-to-frame step inside a sustained run
+TRACK_SILENCE_DB = 40           # frames this far below the loudest count as silence
+
+PitchTrack = namedtuple('PitchTrack', ['times', 'frequency', 'confidence', 'level', 'cents'])
+
+SustainedPitch = namedtuple('SustainedPitch', ['frequency', 'start', 'end'])
+
+# ==================== FUNCTIONS ====================
+
+def track_pitch(audio_data, sample_rate, target_freq=None, method=DEFAULT_DETECTOR,
+                frame_seconds=TRACK_FRAME_SECONDS, hop_seconds=TRACK_HOP_SECONDS,
+                prefiltered=False, freq_range=GUITAR_RANGE):
+    """Pitch of every frame of a clip, return a PitchTrack
+
+    All frames come from one strided view and go through one batched rfft.
+    cents is relative to target_freq (NaN when no target is given).
+    """
+    if not prefiltered:
+        audio_data = FilterChain(sample_rate).filter_offline(audio_data)
+
+    frame_size = max(3, int(frame_seconds * sample_rate))
+    hop_size = max(1, int(hop_seconds * sample_rate))
+    if len(audio_data) < frame_size:
+        frame_size = len(audio_data)
+
+    frames = SpectralFrames(audio_data, sample_rate, frame_size, hop_size, TRACK_ZERO_PAD)
+    frequency, confidence = estimate_frames(frames, method, freq_range)
+    track = PitchTrack(frames.times, frequency, confidence, frames.level, None)
+    return with_target(track, target_freq)
+
+def with_target(track, target_freq):
+    """Recompute the cents column of a track for another target"""
+    if target_freq is None:
+        cents = np.full(len(track.times), np.nan)
+    else:
+        with np.errstate(invalid='ignore'):
+            cents = 1200 * np.log2(track.frequency / target_freq)
+    return track._replace(cents=cents)
+
+def voiced_frames(track, min_confidence=TRACK_MIN_CONFIDENCE, silence_db=TRACK_SILENCE_DB):
+    """Mask of non-silent frames with a pitch and reasonable confidence"""
+    voiced = np.isfinite(track.frequency)
+    voiced &= track.level >= track.level.max() * 10 ** (-silence_db / 20)
+    if not voiced.any():
+        return voiced
+    return voiced & (track.confidence >= min_confidence * track.confidence[voiced].max())
+
+def sustained_pitch(track, max_step_cents=TRACK_STABLE_CENTS,
+                    min_confidence=TRACK_MIN_CONFIDENCE):
+    """Median pitch of the longest stable voiced run, return SustainedPitch or None"""
+    voiced = voiced_frames(track, min_confidence)
+    if not voiced.any():
+        return None
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        steps = np.abs(1200 * np.diff(np.log2(track.frequency)))
+    linked = voiced[:-1] & voiced[1:] & (steps <= max_step_cents)
+
+    # Longest chain of linked frames (a lone voiced frame is a run of one)
+    best_start, best_len = int(np.argmax(voiced)), 1
+    start = None
+    for i, link in enumerate(np.append(linked, False)):
+        if link and start is None:
+            start = i
+        elif not link and start is not None:
+            if i + 1 - start > best_len:
+                best_start, best_len = start, i + 1 - start
+            start = None
+
+    run = slice(best_start, best_start + best_len)
+    return SustainedPitch(
+        float(np.median(track.frequency[run])),
+        float(track.times[run][0]),
+        float(track.times[run][-1])
+    )